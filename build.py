@@ -58,11 +58,20 @@ Options:
   # Actions
   --push                  Push images to registry after successful build.
   --dry-run               Generate Dockerfiles in build/ directory but do NOT build images.
+  --verify-urls           Check Nexus URLs even with --dry-run.
   --check                 Only check Nexus URLs and Java versions without building or generating files.
   --no-cache              Do not use Docker cache when building.
+  --buildkit              Build with docker buildx (inline cache export; with --push,
+                          build and push in a single step).
+  --force                 Rebuild even if the Nexus artifact is unchanged since the last build.
   --pull                  Always attempt to pull a newer version of the image.
-  --update-metadata       Force update of Nexus metadata (ignore cache).
+  --update-metadata       Force update of Nexus metadata and the build plan (ignore cache).
+  --no-url-cache          Revalidate Nexus URLs even if they were checked in the last hour.
   --build-builders        Force rebuilding of base builder images (gradle/maven).
+  --jobs=<n>              Number of services to build in parallel. Docker output of
+                          parallel builds is streamed with a [service] prefix and
+                          written to build/<service>/build.log.
+                          Default: min(number of services, CPU count).
 
   # Configuration Files
   --config=<file>         Path to local build config overrides [default: build-config.yml].
@@ -75,32 +84,35 @@ Options:
 
 """
 
-import os
-import sys
-import yaml
-from packaging import version as pkg_version
+import fnmatch
+import hashlib
 import json
+import os
+import re
 import shutil
 import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
 from docopt import docopt
-from string import Template
-import urllib.request
-import urllib.error
-import xml.etree.ElementTree as ET
+
+# Network, XML and version parsing modules (requests, xml.etree,
+# packaging, yaml, deps_utils) are imported where they are used, so --help
+# and cache-only paths do not pay their import cost.
 
 # Add scripts dir to path to import deps_utils
 sys.path.append(os.path.join(os.path.dirname(__file__), "scripts"))
-try:
-    import deps_utils
-except ImportError:
-    deps_utils = None
+import cache_utils
 
 # Determine script location to resolve relative paths correctly
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 
 # Constants
-import hashlib
-
 DEFAULT_REGISTRY = "livingatlases"
 DEFAULT_DEPENDENCIES_URL = "https://raw.githubusercontent.com/living-atlases/la-toolkit-backend/master/assets/dependencies.yaml"
 # Defaults if not found in dependencies
@@ -109,6 +121,91 @@ BUILD_DIR_BASE = os.path.join(SCRIPT_DIR, "build")
 TEMPLATES_DIR = os.path.join(SCRIPT_DIR, "templates")
 SERVICES_DIR = os.path.join(SCRIPT_DIR, "services")
 BUILDERS_DIR = os.path.join(SCRIPT_DIR, "builders")
+SERVICES_SCHEMA_FILE = os.path.join(SCRIPT_DIR, "services-schema.json")
+NEXUS_BASE_URL = "https://nexus.ala.org.au"
+NEXUS_CHECK_WORKERS = 16
+TAG_PUSH_WORKERS = 4
+GITHUB_API_URL = "https://api.github.com"
+# Base URL of the au.org.ala group in each Nexus repository
+NEXUS_GROUP_URLS = {
+    repo: f"{NEXUS_BASE_URL}/repository/{repo}/au/org/ala"
+    for repo in ("releases", "snapshots")
+}
+
+# ${NAME} placeholders in Dockerfile templates; unknown names are left as-is
+_SUBST_RE = re.compile(r"\$\{(\w+)\}")
+
+
+@lru_cache(maxsize=None)
+def _get_deps_utils():
+    """Import deps_utils on first use (None if its dependencies are missing)"""
+    try:
+        import deps_utils
+    except ImportError:
+        return None
+    return deps_utils
+
+
+@lru_cache(maxsize=None)
+def _get_service_validator():
+    """
+    Compile services-schema.json with fastjsonschema on first use.
+    Returns None if fastjsonschema is not installed (validation is skipped).
+    """
+    try:
+        import fastjsonschema
+    except ImportError:
+        return None
+
+    with open(SERVICES_SCHEMA_FILE, "r") as f:
+        return fastjsonschema.compile(json.load(f))
+
+
+@lru_cache(maxsize=None)
+def get_http_session():
+    """
+    Shared keep-alive session for Nexus and GitHub API requests, so concurrent
+    checks reuse TLS connections instead of opening one per request.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Retry transient connection failures only; HTTP errors are handled by callers
+    retries = Retry(total=3, connect=3, read=2, status=0, backoff_factor=0.3)
+    session = requests.Session()
+    for base_url in (NEXUS_BASE_URL, GITHUB_API_URL):
+        session.mount(
+            base_url,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=NEXUS_CHECK_WORKERS,
+                max_retries=retries,
+            ),
+        )
+    return session
+
+
+# (tool, java_version) builders already checked, pulled or built in this run
+_ensured_builders = set()
+
+
+@lru_cache(maxsize=None)
+def get_local_images():
+    """
+    Set of local docker images ("repository:tag"), listed with a single
+    docker images call per process instead of one inspect per image.
+    Images built by this process are added to it.
+    """
+    try:
+        output = subprocess.check_output(
+            ["docker", "images", "--format", "{{.Repository}}:{{.Tag}}"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return set()
+    return set(output.split())
 
 
 def ensure_builders(
@@ -118,23 +215,21 @@ def ensure_builders(
     Ensure the required builder image exists locally.
     If not, build it from the builders/ directory.
     Note: Builders are kept LOCAL-ONLY and not prefixed with registry.
+    Each (tool, java_version) is handled once per run, even when forced.
     """
     if str(java_version).lower() == "none":
         return
 
+    key = (tool, str(java_version))
+    if key in _ensured_builders:
+        return
+    _ensured_builders.add(key)
+
     image_name = f"{tool}-builder:jdk{java_version}"
 
     # Check if image exists locally
-    try:
-        if not force_rebuild and not pull:
-            subprocess.check_call(
-                ["docker", "image", "inspect", image_name],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            return
-    except subprocess.CalledProcessError:
-        pass  # Not found or forced
+    if not force_rebuild and not pull and image_name in get_local_images():
+        return
 
     # If using pull, we pull the EXTERNAL BASE image of the builder
     if pull:
@@ -152,17 +247,7 @@ def ensure_builders(
                     f"   [Dry Run] Would pull external base image for builder: {base_image}"
                 )
             else:
-                print(f"   📡 Pulling external base image for builder: {base_image}...")
-                try:
-                    subprocess.check_call(
-                        ["docker", "pull", base_image],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                    )
-                except subprocess.CalledProcessError:
-                    print(
-                        f"   ⚠️  Warning: Failed to pull base image {base_image}. Build might use local cache."
-                    )
+                pull_base_image(base_image, "external base image for builder")
 
     if dry_run:
         print(f"   [Dry Run] Would build builder image: {image_name}")
@@ -195,6 +280,7 @@ def ensure_builders(
     try:
         subprocess.check_call(cmd, cwd=builder_path)
         print(f"   ✅ Builder image {image_name} built successfully.")
+        get_local_images().add(image_name)
     except subprocess.CalledProcessError as e:
         print(f"   ❌ Failed to build builder image {image_name}")
         sys.exit(1)
@@ -213,84 +299,117 @@ def load_config(config_file, defs_file):
         print(f"Error: Services definition file not found: {defs_file}")
         sys.exit(1)
 
-    with open(defs_file, "r") as f:
-        defs = yaml.safe_load(f)
-
-    config = {"services": {}}
-
     if not os.path.isabs(config_file) and config_file == "build-config.yml":
         config_file = os.path.join(SCRIPT_DIR, config_file)
 
+    # The merged, validated config only depends on these files, so warm runs
+    # skip parsing, merging and schema validation entirely
+    return cache_utils.load_derived_cached(
+        (defs_file, config_file, SERVICES_SCHEMA_FILE),
+        lambda: merge_config(config_file, defs_file),
+    )
+
+
+def merge_config(config_file, defs_file):
+    """Merge service definitions with the optional user config and validate them"""
+    defs = cache_utils.load_yaml_cached(defs_file)
+
+    config = {"services": {}}
+
     if os.path.exists(config_file):
-        with open(config_file, "r") as f:
-            user_config = yaml.safe_load(f) or {}
-            config.update(user_config)
+        user_config = cache_utils.load_yaml_cached(config_file) or {}
+        config.update(user_config)
 
     # Merge definitions into config (user config takes precedence)
-    merged_services = defs.get("services", {}).copy()
+    merged_services = {**defs.get("services", {})}
 
     # Update with overrides from build-config
     if "services" in config and config["services"]:
         for name, overrides in config["services"].items():
             if name in merged_services:
-                merged_services[name].update(overrides)
+                merged_services[name] = {**merged_services[name], **overrides}
             else:
                 merged_services[name] = overrides
 
+    validate_services(merged_services)
+
     return {
         "global_defaults": config.get("global_defaults", {}),
         "services": merged_services,
     }
 
 
-def get_service_config(service_name, config, args):
+def validate_services(services):
+    """Validate merged service definitions against services-schema.json"""
+    validate = _get_service_validator()
+    if not validate:
+        return
+
+    import fastjsonschema
+
+    errors = []
+    for name, svc in services.items():
+        try:
+            validate(svc or {})
+        except fastjsonschema.JsonSchemaValueException as e:
+            errors.append(f"{name}: {e.message}")
+
+    if errors:
+        print("Error: Invalid service configuration:")
+        for error in errors:
+            print(f"   - {error}")
+        sys.exit(1)
+
+
+# CLI options overriding service config keys ({option: config key})
+CLI_OVERRIDE_OPTIONS = {
+    "--tag": "version",
+    "--registry": "registry",
+    "--build-method": "build_method",
+    "--java-version": "java_version",
+    "--java-base": "java_base_image",
+    "--repo": "repository",
+    "--branch": "branch",
+    "--commit": "commit",
+    "--push": "push",
+    "--pull": "pull",
+    "--buildkit": "buildkit",
+}
+
+
+def get_cli_overrides(args):
+    """Collect the service config overrides given on the command line, once per run"""
+    return {
+        key: args[option]
+        for option, key in CLI_OVERRIDE_OPTIONS.items()
+        if args.get(option)
+    }
+
+
+def get_service_config(service_name, config, cli_overrides):
     """Resolve final configuration for a service"""
     if service_name not in config["services"]:
         print(f"Error: Service '{service_name}' not defined")
         sys.exit(1)
 
-    svc = config["services"][service_name].copy()
     defaults = config["global_defaults"]
 
-    # 1. Defaults
-    final_config = {
+    return {
+        # 1. Defaults
         "registry": defaults.get("registry", DEFAULT_REGISTRY),
         #'java_version': defaults.get('java_version', DEFAULT_JAVA_VERSION), # Now determined dynamically
         "build_method": defaults.get("build_method", "nexus"),
         "push": False,
+        # 2. Service config
+        **config["services"][service_name],
+        # 3. CLI arguments overrides
+        **cli_overrides,
     }
 
-    # 2. Service config
-    final_config.update(svc)
-
-    # 3. CLI arguments overrides
-    if args["--tag"]:
-        final_config["version"] = args["--tag"]
-    if args["--registry"]:
-        final_config["registry"] = args["--registry"]
-    if args["--build-method"]:
-        final_config["build_method"] = args["--build-method"]
-    if args["--java-version"]:
-        final_config["java_version"] = args["--java-version"]
-    if args["--java-base"]:
-        final_config["java_base_image"] = args["--java-base"]
-    if args["--repo"]:
-        final_config["repository"] = args["--repo"]
-    if args["--branch"]:
-        final_config["branch"] = args["--branch"]
-    if args["--commit"]:
-        final_config["commit"] = args["--commit"]
-    if args["--push"]:
-        final_config["push"] = True
-    if args["--pull"]:
-        final_config["pull"] = True
-
-    return final_config
-
-
-def check_nexus_url(service_name, config):
+
+def get_nexus_artifact_url(service_name, config):
     """
-    Check if the Nexus URL for the artifact is reachable.
+    Build the Nexus download URL for a service artifact.
     Replicates logic from download-artifact.sh.
     """
     artifact = config.get("artifacts", service_name)
@@ -299,9 +418,7 @@ def check_nexus_url(service_name, config):
     extension = config.get("extension", "war")
 
     # Determine repository
-    nexus_repo = "releases"
-    if "SNAPSHOT" in version:
-        nexus_repo = "snapshots"
+    nexus_repo = "snapshots" if "SNAPSHOT" in version else "releases"
 
     # Construct artifact name
     # artifact-version[-classifier].extension
@@ -312,90 +429,319 @@ def check_nexus_url(service_name, config):
 
     # Construct URL
     # https://nexus.ala.org.au/repository/{nexus_repo}/au/org/ala/{ARTIFACT}/{VERSION}/{full_artifact_name}
-    nexus_base_url = f"https://nexus.ala.org.au/repository/{nexus_repo}"
-    nexus_url = f"{nexus_base_url}/au/org/ala/{artifact}/{version}/{full_artifact_name}"
+    nexus_url = (
+        f"{NEXUS_GROUP_URLS[nexus_repo]}/{artifact}/{version}/{full_artifact_name}"
+    )
+
+    return nexus_url
+
+
+@lru_cache(maxsize=None)
+def head_nexus_url(nexus_url):
+    """
+    HEAD a Nexus URL once per process.
+    Returns the response headers if it exists, otherwise None.
+    """
+    import requests
 
     try:
-        req = urllib.request.Request(nexus_url, method="HEAD")
         # Add a timeout to avoid hanging
-        with urllib.request.urlopen(req, timeout=10) as response:
-            if response.status == 200:
-                return True, nexus_url
-            else:
-                return False, nexus_url
-    except (urllib.error.URLError, Exception):
+        resp = get_http_session().head(nexus_url, timeout=10, allow_redirects=True)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+    return resp.headers
+
+
+def check_nexus_url(service_name, config, use_url_cache=True):
+    """
+    Check if the Nexus URL for the artifact is reachable.
+    URLs seen within ARTIFACTS_SEEN_TTL_SECONDS are trusted without a request
+    unless use_url_cache is False.
+    """
+    nexus_url = get_nexus_artifact_url(service_name, config)
+
+    if use_url_cache and is_artifact_seen(nexus_url):
+        return True, nexus_url
+
+    # Versions resolved from maven-metadata.xml are known to be published, but
+    # that only vouches for the main artifact, not a classifier or another
+    # extension (e.g. -exec.jar)
+    if (
+        config.get("version_in_metadata")
+        and not config.get("classifier")
+        and config.get("extension", "war") == "war"
+    ):
+        mark_artifact_seen(nexus_url)
+        return True, nexus_url
+
+    headers = head_nexus_url(nexus_url)
+    if headers is None:
         return False, nexus_url
+    mark_artifact_seen(nexus_url, headers.get("Content-Length"), headers.get("ETag"))
+    return True, nexus_url
 
 
-import hashlib
-import time
-from pathlib import Path
+def fetch_artifact_sha1(nexus_url, use_url_cache=True):
+    """
+    Fetch the SHA1 digest Nexus publishes next to an artifact (<url>.sha1).
+    Digests are kept in the artifacts-seen manifest while its entry is fresh.
+    """
+    import requests
+
+    if use_url_cache:
+        with _artifacts_seen_lock:
+            entry = _get_artifacts_seen().get(nexus_url) or {}
+        if entry.get("sha1"):
+            return entry["sha1"]
+
+    try:
+        resp = get_http_session().get(f"{nexus_url}.sha1", timeout=10)
+        if resp.status_code != 200:
+            return None
+    except requests.RequestException:
+        return None
+
+    # The file may contain "<digest>  <filename>"
+    sha1 = resp.text.strip().split()[0] if resp.text.strip() else None
+    with _artifacts_seen_lock:
+        entry = _get_artifacts_seen().get(nexus_url)
+        if entry is not None:
+            entry["sha1"] = sha1
+    return sha1
+
+
+def check_service_nexus(service_name, config, use_url_cache=True, with_sha1=False):
+    """
+    Check the Nexus URL of a service and return a check result entry.
+    With with_sha1, the artifact digest is fetched too (used to skip unchanged builds).
+    """
+    success, url = check_nexus_url(service_name, config, use_url_cache)
+    # A SNAPSHOT can be republished at any time, so its digest is never cached
+    sha1_from_cache = use_url_cache and "SNAPSHOT" not in url
+    sha1 = fetch_artifact_sha1(url, sha1_from_cache) if success and with_sha1 else None
+    return {
+        "name": service_name,
+        "version": config.get("version"),
+        "java_version": config.get("java_version"),
+        "url": url,
+        "success": success,
+        "icon": "✅" if success else "❌",
+        "sha1": sha1,
+    }
+
 
 # Metadata Cache Configuration
 METADATA_CACHE_DIR = Path.home() / ".cache" / "la-docker-images" / "metadata"
 TAGS_CACHE_DIR = Path.home() / ".cache" / "la-docker-images" / "tags"
 CACHE_DURATION_SECONDS = 24 * 60 * 60  # 24 hours
+GITHUB_RATE_LIMIT_WARNING = 10  # Warn when fewer API requests remain
+METADATA_MISSING_TTL_SECONDS = 60 * 60  # 1 hour
+
+# Resolved build plans, reused by identical invocations for an hour
+PLANS_CACHE_DIR = Path.home() / ".cache" / "la-docker-images" / "plans"
+PLAN_CACHE_TTL_SECONDS = 60 * 60
+# CLI options that do not change the plan (only how it is executed)
+PLAN_IGNORED_OPTIONS = (
+    "--dry-run",
+    "--verify-urls",
+    "--check",
+    "--no-cache",
+    "--force",
+    "--jobs",
+    "--no-url-cache",
+    "--build-builders",
+    "--update-metadata",
+)
+
+# Nexus URLs that passed a check recently ({url: {ts, size, etag}})
+ARTIFACTS_SEEN_FILE = (
+    Path.home() / ".cache" / "la-docker-images" / "artifacts-seen.json"
+)
+ARTIFACTS_SEEN_TTL_SECONDS = 60 * 60  # 1 hour
+_artifacts_seen = None
+_artifacts_seen_lock = threading.Lock()
+
+
+def _get_artifacts_seen():
+    """Load the artifacts-seen manifest once per process (call with the lock held)"""
+    global _artifacts_seen
+    if _artifacts_seen is None:
+        try:
+            with open(ARTIFACTS_SEEN_FILE, "rb") as f:
+                _artifacts_seen = cache_utils.json_loads(f.read())
+        except (OSError, ValueError):
+            _artifacts_seen = {}
+    return _artifacts_seen
+
+
+def is_artifact_seen(url):
+    """Check if a Nexus URL was successfully checked within the TTL"""
+    with _artifacts_seen_lock:
+        entry = _get_artifacts_seen().get(url)
+    if not entry:
+        return False
+    return time.time() - entry.get("ts", 0) < ARTIFACTS_SEEN_TTL_SECONDS
+
+
+def mark_artifact_seen(url, size=None, etag=None):
+    """Record a successful Nexus URL check"""
+    with _artifacts_seen_lock:
+        _get_artifacts_seen()[url] = {"ts": time.time(), "size": size, "etag": etag}
+
+
+def save_artifacts_seen():
+    """Persist the artifacts-seen manifest, dropping expired entries"""
+    with _artifacts_seen_lock:
+        if _artifacts_seen is None:
+            return
+        now = time.time()
+        seen = {
+            url: entry
+            for url, entry in _artifacts_seen.items()
+            if now - entry.get("ts", 0) < ARTIFACTS_SEEN_TTL_SECONDS
+        }
+    try:
+        ARTIFACTS_SEEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = ARTIFACTS_SEEN_FILE.with_suffix(".json.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(cache_utils.json_dumps(seen))
+        os.replace(tmp_file, ARTIFACTS_SEEN_FILE)
+    except OSError as e:
+        print(f"   ⚠️  Warning: Could not save artifacts cache: {e}")
+
+
+def url_cache_key(url):
+    """Cache file name for a URL (BLAKE2b-128: fast, and not MD5 for FIPS hosts)"""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
 
 
-def get_cached_metadata(url):
+def get_metadata_cache_file(url, suffix=".xml"):
     """
-    Retrieve metadata from cache if valid.
+    Cache file for a metadata URL: .xml holds the body, .meta.json the
+    response validators and .missing marks a recent 404.
     """
-    if not METADATA_CACHE_DIR.exists():
-        return None
+    return METADATA_CACHE_DIR / (url_cache_key(url) + suffix)
+
 
-    # Generate filename from URL hash
-    filename = hashlib.md5(url.encode("utf-8")).hexdigest() + ".xml"
-    cache_file = METADATA_CACHE_DIR / filename
+def get_cached_metadata(url, max_age=CACHE_DURATION_SECONDS):
+    """
+    Retrieve metadata (raw bytes) from cache if valid.
+    With max_age=None the cached body is returned regardless of its age.
+    """
+    cache_file = get_metadata_cache_file(url)
 
     if not cache_file.exists():
         return None
 
     # Check file age
     file_age = time.time() - cache_file.stat().st_mtime
-    if file_age > CACHE_DURATION_SECONDS:
+    if max_age is not None and file_age > max_age:
         return None
 
     try:
-        with open(cache_file, "r") as f:
-            # Check if file is empty
-            content = f.read()
-            if not content:
-                return None
-            return content
+        # An empty file counts as a miss
+        return cache_file.read_bytes() or None
     except Exception as e:
         print(f"   ⚠️  Warning: Could not load cache: {e}")
         return None
 
 
-def save_cached_metadata(url, content):
+def save_cached_metadata(url, content, etag=None, last_modified=None):
     """
-    Save metadata to cache.
+    Save metadata (raw response bytes) to cache, with the validators for
+    later conditional GETs.
     """
     try:
         METADATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Generate filename from URL hash
-        filename = hashlib.md5(url.encode("utf-8")).hexdigest() + ".xml"
-        cache_file = METADATA_CACHE_DIR / filename
-
-        with open(cache_file, "w") as f:
-            f.write(content)
+        # Written atomically: metadata is fetched from several threads
+        cache_utils.atomic_write_bytes(get_metadata_cache_file(url), content)
+        cache_utils.atomic_write_bytes(
+            get_metadata_cache_file(url, ".meta.json"),
+            cache_utils.json_dumps({"etag": etag, "last_modified": last_modified}),
+        )
+        get_metadata_cache_file(url, ".missing").unlink(missing_ok=True)
     except Exception as e:
         print(f"   ⚠️  Warning: Could not save to cache: {e}")
 
 
+def get_metadata_validators(url):
+    """Conditional GET headers for a cached metadata URL"""
+    return load_cache_validators(
+        get_metadata_cache_file(url), get_metadata_cache_file(url, ".meta.json")
+    )
+
+
+def load_cache_validators(body_file, meta_file):
+    """Conditional GET headers from the validators saved next to a cached body"""
+    if not body_file.exists():
+        return {}
+    try:
+        with open(meta_file, "rb") as f:
+            meta = cache_utils.json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def is_metadata_missing(url):
+    """Check if the metadata URL returned 404 within METADATA_MISSING_TTL_SECONDS"""
+    missing_file = get_metadata_cache_file(url, ".missing")
+    try:
+        file_age = time.time() - missing_file.stat().st_mtime
+    except OSError:
+        return False
+    return file_age <= METADATA_MISSING_TTL_SECONDS
+
+
+def mark_metadata_missing(url):
+    """Remember that the metadata URL returned 404"""
+    try:
+        METADATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        get_metadata_cache_file(url, ".missing").touch()
+    except OSError as e:
+        print(f"   ⚠️  Warning: Could not save to cache: {e}")
+
+
+@lru_cache(maxsize=4096)
+def parse_version(version_str):
+    """
+    Parse a version string for sorting, memoized across services.
+    Unparseable versions sort first instead of breaking the semantic ordering
+    of all the others.
+    """
+    from packaging import version as pkg_version
+
+    try:
+        return pkg_version.parse(version_str)
+    except (pkg_version.InvalidVersion, TypeError):
+        return pkg_version.Version("0")
+
+
 def get_nexus_versions(service_name, config, n=1, update_metadata=False):
     """Fetch last N versions from Nexus metadata"""
+    import io
+    import xml.etree.ElementTree as ET
+
     artifact = config.get("artifacts", service_name)
     # Default to releases for metadata search
-    nexus_base = "https://nexus.ala.org.au/repository/releases"
-    url = f"{nexus_base}/au/org/ala/{artifact}/maven-metadata.xml"
+    url = f"{NEXUS_GROUP_URLS['releases']}/{artifact}/maven-metadata.xml"
 
     xml_content = None
     from_cache = False
 
     if not update_metadata:
+        if is_metadata_missing(url):
+            print(f"   ⚠️  Metadata for {service_name} recently not found (cached)")
+            return []
         xml_content = get_cached_metadata(url)
         if xml_content:
             from_cache = True
@@ -403,13 +749,28 @@ def get_nexus_versions(service_name, config, n=1, update_metadata=False):
 
     if not xml_content:
         print(f"   🔎 Fetching metadata for {service_name}: {url}")
+        headers = {} if update_metadata else get_metadata_validators(url)
         try:
-            with urllib.request.urlopen(url) as response:
-                if response.status != 200:
-                    print(f"   ⚠️  Failed to fetch metadata for {service_name}")
-                    return []
-                xml_content = response.read().decode("utf-8")
-                save_cached_metadata(url, xml_content)
+            response = get_http_session().get(url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                print(f"   📦 Metadata for {service_name} not modified, using cache")
+                get_metadata_cache_file(url).touch()
+                xml_content = get_cached_metadata(url, max_age=None)
+            elif response.status_code == 404:
+                print(f"   ⚠️  Metadata for {service_name} not found")
+                mark_metadata_missing(url)
+                return []
+            elif response.status_code != 200:
+                print(f"   ⚠️  Failed to fetch metadata for {service_name}")
+                return []
+            else:
+                xml_content = response.content
+                save_cached_metadata(
+                    url,
+                    xml_content,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
         except Exception as e:
             print(f"   ⚠️  Error fetching metadata for {service_name}: {e}")
             return []
@@ -417,21 +778,23 @@ def get_nexus_versions(service_name, config, n=1, update_metadata=False):
         print(f"   📦 Using cached metadata for {service_name}")
 
     try:
-        root = ET.fromstring(xml_content)
         # <versioning><versions><version>...</version></versions></versioning>
-        versions = [v.text for v in root.findall(".//version")]
+        # Stream the document and drop each element once seen, so large
+        # metadata files never build a full tree.
+        versions = []
+        source = io.BytesIO(xml_content)
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if elem.tag == "version":
+                versions.append(elem.text)
+            elif elem.tag == "versions":
+                break  # Only <lastUpdated> follows
+            elem.clear()
 
         # Filter out snapshots if we are looking for releases
         # (Though metadata from releases repo shouldn't have them usually)
 
         # Sort versions
-        try:
-            if deps_utils:
-                versions.sort(key=lambda v: deps_utils.pkg_version.parse(v))
-            else:
-                versions.sort()
-        except Exception:
-            versions.sort()
+        versions.sort(key=parse_version)
 
         return versions[-n:]
 
@@ -461,13 +824,13 @@ def get_github_tags(service_name, config, n=1):
         print(f"   ⚠️  Could not parse GitHub URL: {repo_url}")
         return []
 
-    api_url = f"https://api.github.com/repos/{owner_repo}/tags"
+    api_url = f"{GITHUB_API_URL}/repos/{owner_repo}/tags"
 
     # Check cache
     json_content = None
-    cache_file = TAGS_CACHE_DIR / (
-        hashlib.md5(api_url.encode("utf-8")).hexdigest() + ".json"
-    )
+    cache_file = TAGS_CACHE_DIR / (url_cache_key(api_url) + ".json")
+
+    meta_file = cache_file.with_suffix(".meta.json")
 
     if TAGS_CACHE_DIR.exists() and cache_file.exists():
         file_age = time.time() - cache_file.stat().st_mtime
@@ -482,21 +845,44 @@ def get_github_tags(service_name, config, n=1):
     if not json_content:
         print(f"   🔎 Fetching tags from GitHub for {service_name}: {api_url}")
         try:
-            req = urllib.request.Request(api_url)
-            # Add User-Agent to avoid generic blocking
-            req.add_header("User-Agent", "python-urllib")
-            with urllib.request.urlopen(req) as response:
-                if response.status == 200:
-                    data = response.read()
-                    json_content = json.loads(data)
-
-                    # Save to cache
-                    TAGS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-                    with open(cache_file, "w") as f:
-                        f.write(data.decode("utf-8"))  # Save raw string
-                else:
-                    print(f"   ⚠️  Failed to fetch tags: HTTP {response.status}")
-                    return []
+            # Stale cache entries are revalidated; 304s do not count against
+            # the GitHub rate limit
+            response = get_http_session().get(
+                api_url,
+                headers=load_cache_validators(cache_file, meta_file),
+                timeout=30,
+            )
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining and int(remaining) < GITHUB_RATE_LIMIT_WARNING:
+                reset = int(response.headers.get("X-RateLimit-Reset", 0))
+                print(
+                    f"   ⚠️  GitHub API rate limit almost reached: {remaining} requests left until {time.strftime('%H:%M', time.localtime(reset))}"
+                )
+
+            if response.status_code == 304:
+                print(f"   📦 Tags for {service_name} not modified, using cache")
+                cache_file.touch()
+                with open(cache_file, "r") as f:
+                    json_content = json.load(f)
+            elif response.status_code == 200:
+                data = response.content
+                json_content = json.loads(data)
+
+                # Save to cache
+                TAGS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_utils.atomic_write_bytes(cache_file, data)  # Save raw
+                cache_utils.atomic_write_bytes(
+                    meta_file,
+                    cache_utils.json_dumps(
+                        {
+                            "etag": response.headers.get("ETag"),
+                            "last_modified": response.headers.get("Last-Modified"),
+                        }
+                    ),
+                )
+            else:
+                print(f"   ⚠️  Failed to fetch tags: HTTP {response.status_code}")
+                return []
         except Exception as e:
             print(f"   ⚠️  Error fetching GitHub tags: {e}")
             return []
@@ -522,38 +908,32 @@ def get_github_tags(service_name, config, n=1):
         results.append((clean_version, tag_name))
 
     # Sort
-    # Try semver sort
-    try:
-        results.sort(key=lambda x: pkg_version.parse(x[0]))
-    except Exception:
-        results.sort(key=lambda x: x[0])
+    results.sort(key=lambda x: parse_version(x[0]))
 
     return results[-n:]
 
 
-def generate_dockerfile(service_name, config, build_path):
-    """Generate Dockerfile from template"""
+@lru_cache(maxsize=None)
+def _load_template(path, mtime_ns):
+    with open(path, "r") as f:
+        content = f.read()
+    # Alternating literal text and placeholder names: [text, name, text, ...]
+    parts = tuple(_SUBST_RE.split(content))
+    return parts, frozenset(parts[1::2])
 
-    # Check for custom Dockerfile first
-    custom_dockerfile = os.path.join(SERVICES_DIR, service_name, "Dockerfile")
-    template_content = ""
 
-    if os.path.exists(custom_dockerfile):
-        print(f"   ℹ️  Using custom Dockerfile from {custom_dockerfile}")
-        with open(custom_dockerfile, "r") as f:
-            template_content = f.read()
-    else:
-        # Use generic template
-        build_tool = config.get("build_tool", "gradle")
-        template_file = os.path.join(TEMPLATES_DIR, f"Dockerfile.{build_tool}.tmpl")
-        if not os.path.exists(template_file):
-            print(f"Error: Template not found: {template_file}")
-            sys.exit(1)
+def load_template(path):
+    """
+    Load a Dockerfile template, reading each file once per process.
+    Returns (parts, placeholder names used by the template), where parts is
+    the template pre-split into alternating literal text and placeholder names.
+    Keyed by mtime so edits to custom Dockerfiles are still picked up.
+    """
+    return _load_template(path, os.stat(path).st_mtime_ns)
 
-        with open(template_file, "r") as f:
-            template_content = f.read()
 
-    # Prepare variables for substitution
+def build_java_opts(service_name, config):
+    """Build the JAVA_OPTS of a service"""
     java_opts = config.get("java_opts", "")
 
     # 1. Add memory defaults if not explicitly provided
@@ -575,14 +955,12 @@ def generate_dockerfile(service_name, config, build_path):
                     extra_flags.append(f"-D{key}={value}")
 
         if extra_flags:
-            java_opts += " " + " ".join(extra_flags)
+            java_opts = " ".join([java_opts, *extra_flags]).strip()
 
     # 3. Handle Logging Config if specified
-    log_config_filename = config.get("log_config_filename")
     artifact_id = config.get("artifacts", service_name)
-    logging_config = ""
-    if log_config_filename:
-        logging_config = f"/data/{artifact_id}/config/{log_config_filename}"
+    logging_config = get_logging_config(service_name, config)
+    if logging_config:
         # Automatically add -Dlogging.config if not present
         # Note: some apps use -Dlog4j.configurationFile, etc., but -Dlogging.config is common for spring boot/grails
         if "-Dlogging.config" not in java_opts:
@@ -597,67 +975,313 @@ def generate_dockerfile(service_name, config, build_path):
     if "-Dspring.config.name" not in java_opts:
         java_opts += " -Dspring.config.name=application,application-local-config"
 
-    # Standard mapping
-    cache_bypass = str(int(time.time()))
+    return java_opts.strip()
+
+
+def get_logging_config(service_name, config):
+    """Path of the mounted logging config file, if the service defines one"""
+    log_config_filename = config.get("log_config_filename")
+    if not log_config_filename:
+        return ""
+    artifact_id = config.get("artifacts", service_name)
+    return f"/data/{artifact_id}/config/{log_config_filename}"
+
+
+def _registry_prefix(config):
+    registry = config.get("registry", DEFAULT_REGISTRY)
+    if config.get("registry") and not registry.endswith("/"):
+        return registry + "/"
+    return registry
+
+
+def _java_base_image(config):
+    java_version = config.get("java_version")
+    if str(java_version).lower() == "none":
+        return ""
+    return config.get("java_base_image", f"eclipse-temurin:{java_version}-jre-jammy")
+
+
+def _service_user(service_name, config):
+    display_name = config.get("name", service_name)
+    return display_name if " " not in display_name else service_name
+
+
+# Values for the ${NAME} placeholders of Dockerfile templates.
+# Each resolver takes (service_name, config); only placeholders a template
+# actually uses are resolved.
+_TEMPLATE_RESOLVERS = {
+    "SERVICE_NAME": lambda name, config: name,
+    "SERVICE_NAME_UPPER": lambda name, config: name.upper().replace("-", "_"),
+    "DESCRIPTION": lambda name, config: config.get("description", ""),
+    "VERSION": lambda name, config: config.get("version", "latest"),
+    "JAVA_VERSION": lambda name, config: str(config.get("java_version")),
+    "CACHE_BYPASS": lambda name, config: str(int(time.time())),
+    "ARTIFACT_ID": lambda name, config: config.get("artifacts", name),
+    "EXTENSION": lambda name, config: config.get("extension", "war"),
+    "CLASSIFIER": lambda name, config: config.get("classifier", ""),
+    "REPO": lambda name, config: config.get("repository", ""),
+    "BRANCH": lambda name, config: config.get("branch", "master"),
+    "LOG_DIR": lambda name, config: config.get("log_dir", ""),
+    "LOG_CONFIG_FILENAME": lambda name, config: config.get("log_config_filename") or "",
+    "LOGGING_CONFIG": get_logging_config,
+    "JAVA_OPTS": build_java_opts,
+    "PORT": lambda name, config: str(config.get("port", 8080)),
+    "REGISTRY": lambda name, config: _registry_prefix(config),
+    "JAVA_BASE_IMAGE": lambda name, config: _java_base_image(config),
+    "APP_ARGS": lambda name, config: config.get("app_args", ""),
+    "MAVEN_PROFILES": lambda name, config: config.get("maven_profiles", ""),
+    "BUILD_DIR": lambda name, config: config.get("build_dir", "."),
+    "COMMIT": lambda name, config: config.get("commit", "HEAD"),
+    "BUILD_TOOL": lambda name, config: config.get("build_tool", "gradle"),
+    "BUILD_METHOD": lambda name, config: config.get("build_method", "nexus"),
+    "SERVICE_USER": _service_user,
+}
+
+
+def generate_dockerfile(service_name, config, build_path):
+    """Generate Dockerfile from template"""
+
+    # Check for custom Dockerfile first
+    custom_dockerfile = os.path.join(SERVICES_DIR, service_name, "Dockerfile")
+
+    # load_template stats the file anyway, so no separate exists() check
+    try:
+        template_parts, template_vars = load_template(custom_dockerfile)
+        print(f"   ℹ️  Using custom Dockerfile from {custom_dockerfile}")
+    except FileNotFoundError:
+        # Use generic template
+        build_tool = config.get("build_tool", "gradle")
+        template_file = os.path.join(TEMPLATES_DIR, f"Dockerfile.{build_tool}.tmpl")
+        try:
+            template_parts, template_vars = load_template(template_file)
+        except FileNotFoundError:
+            print(f"Error: Template not found: {template_file}")
+            sys.exit(1)
+
+    # Resolve only the placeholders used by this template
     mapping = {
-        "SERVICE_NAME": service_name,
-        "SERVICE_NAME_UPPER": service_name.upper().replace("-", "_"),
-        "DESCRIPTION": config.get("description", ""),
-        "VERSION": config.get("version", "latest"),
-        "JAVA_VERSION": str(config.get("java_version")),
-        "CACHE_BYPASS": cache_bypass,
-        "ARTIFACT_ID": config.get("artifacts", service_name),
-        "EXTENSION": config.get("extension", "war"),
-        "CLASSIFIER": config.get("classifier", ""),
-        "REPO": config.get("repository", ""),
-        "BRANCH": config.get("branch", "master"),
-        "LOG_DIR": config.get("log_dir", ""),
-        "LOG_CONFIG_FILENAME": log_config_filename or "",
-        "LOGGING_CONFIG": logging_config,
-        "JAVA_OPTS": java_opts.strip(),
-        "PORT": str(config.get("port", 8080)),
-        "REGISTRY": config.get("registry", DEFAULT_REGISTRY)
-        + (
-            "/"
-            if config.get("registry") and not config.get("registry").endswith("/")
-            else ""
-        ),
-        "JAVA_BASE_IMAGE": config.get(
-            "java_base_image", f"eclipse-temurin:{config.get('java_version')}-jre-jammy"
-        )
-        if str(config.get("java_version")).lower() != "none"
-        else "",
-        "APP_ARGS": config.get("app_args", ""),
-        "MAVEN_PROFILES": config.get("maven_profiles", ""),
-        "BUILD_DIR": config.get("build_dir", "."),
-        "COMMIT": config.get("commit", "HEAD"),
-        "BUILD_TOOL": config.get("build_tool", "gradle"),
-        "BUILD_METHOD": config.get("build_method", "nexus"),
-        "SERVICE_USER": config.get("name", service_name)
-        if " " not in config.get("name", service_name)
-        else service_name,
+        var: _TEMPLATE_RESOLVERS[var](service_name, config)
+        for var in template_vars
+        if var in _TEMPLATE_RESOLVERS
     }
 
-    if config.get("log_config_filename"):
-        artifact_id = mapping["ARTIFACT_ID"]
-        filename = config["log_config_filename"]
-        mapping["LOGGING_CONFIG"] = f"/data/{artifact_id}/config/{filename}"
-
     # Safe substitution
     try:
-        t = Template(template_content)
-        dockerfile_content = t.safe_substitute(mapping)
+        # No regex scan per service: odd parts are the placeholder names
+        dockerfile_content = "".join(
+            mapping.get(part, f"${{{part}}}") if i % 2 else part
+            for i, part in enumerate(template_parts)
+        )
 
-        with open(os.path.join(build_path, "Dockerfile"), "w") as f:
-            f.write(dockerfile_content)
+        write_if_changed(os.path.join(build_path, "Dockerfile"), dockerfile_content)
 
     except Exception as e:
         print(f"Error generating Dockerfile: {e}")
         sys.exit(1)
 
 
-def build_service(service_name, service_config, dry_run=False, no_cache=False):
-    """Build the docker image"""
+# Files that make up a generated build context (relative to build/<service>/)
+BUILD_CONTEXT_FILES = (
+    "Dockerfile",
+    "settings.xml",
+    os.path.join("scripts", "download-artifact.sh"),
+)
+# Local files kept next to the context but excluded from it
+BUILD_CONTEXT_IGNORED = (
+    ".dockerignore",
+    ".context-manifest",
+    ".built-sha-*",  # One build record per version
+    "build.log",
+)
+
+
+def write_if_changed(path, content):
+    """Atomically write a file, leaving it untouched if the content is identical"""
+    try:
+        with open(path, "r") as f:
+            if f.read() == content:
+                return
+    except OSError:
+        pass
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def sync_file(src, dest):
+    """
+    Copy src to dest only if dest is missing or its content differs, so an
+    unchanged build context keeps its mtimes. A copy (not a link) keeps edits
+    in build/ from reaching the tracked source files.
+    """
+    import filecmp
+
+    if os.path.exists(dest):
+        # Contexts from older runs may hold hard links to the sources; replace them
+        if not os.path.samefile(src, dest) and filecmp.cmp(src, dest, shallow=False):
+            return
+        os.remove(dest)
+
+    shutil.copy2(src, dest)
+
+
+def prune_build_context(build_path):
+    """
+    Remove files that are no longer part of the build context and record the
+    expected files in .context-manifest.
+    """
+    expected = set(BUILD_CONTEXT_FILES) | set(BUILD_CONTEXT_IGNORED)
+
+    for root, dirs, files in os.walk(build_path, topdown=False):
+        for filename in files:
+            path = os.path.join(root, filename)
+            relpath = os.path.relpath(path, build_path)
+            if not any(fnmatch.fnmatch(relpath, pattern) for pattern in expected):
+                os.remove(path)
+        if root != build_path and not os.listdir(root):
+            os.rmdir(root)
+
+    write_if_changed(
+        os.path.join(build_path, ".context-manifest"),
+        "".join(f"{name}\n" for name in BUILD_CONTEXT_FILES),
+    )
+
+
+# External base images pulled (or attempted) in this run: {image: succeeded}
+_pulled_images = {}
+_pulled_images_lock = threading.Lock()
+
+
+def pull_base_image(base_image, description="external base image"):
+    """
+    docker pull a base image at most once per run, even when several
+    services (possibly building in parallel) share it. Failed pulls are not
+    retried either; the build then uses the local copy.
+    """
+    with _pulled_images_lock:
+        if base_image in _pulled_images:
+            return _pulled_images[base_image]
+
+        print(f"   📡 Pulling {description}: {base_image}...")
+        try:
+            subprocess.check_call(
+                ["docker", "pull", base_image],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            _pulled_images[base_image] = True
+        except subprocess.CalledProcessError:
+            print(
+                f"   ⚠️  Warning: Failed to pull base image {base_image}. Build might use local cache."
+            )
+            _pulled_images[base_image] = False
+        return _pulled_images[base_image]
+
+
+def run_docker(cmd, log=None, prefix=None, **kwargs):
+    """
+    Run a docker command. Without log, output goes straight to the console.
+    With log, output is piped line by line into the log file and echoed live
+    to the console prefixed with [prefix].
+    Raises CalledProcessError on failure, like subprocess.check_call.
+    """
+    if log is None:
+        return subprocess.check_call(cmd, **kwargs)
+
+    # Bypass the per-thread buffer of BufferedThreadOutput for live output
+    echo = getattr(sys.stdout, "write_live", sys.stdout.write)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        # Build tools may print bytes that are not valid UTF-8
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        **kwargs,
+    ) as proc:
+        for line in proc.stdout:
+            log.write(line)
+            echo(f"   [{prefix}] {line}")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return 0
+
+
+def hash_build_context(build_path):
+    """
+    sha256 over the names and contents of all files in the build context
+    (Dockerfile, download-artifact.sh, settings.xml and any per-service files),
+    so that editing any of them triggers a rebuild.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(build_path):
+        dirs.sort()
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            relpath = os.path.relpath(path, build_path)
+            if any(
+                fnmatch.fnmatch(relpath, pattern) for pattern in BUILD_CONTEXT_IGNORED
+            ):
+                continue
+            digest.update(relpath.encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def load_build_record(built_sha_file):
+    """Read the record of the last build of a version, or None"""
+    try:
+        with open(built_sha_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_build_unchanged(built, build_record, service_config, no_cache=False):
+    """
+    Check if the image was last built (and pushed, if requested) from the same
+    artifact sha1 and build context, and still exists locally. Additional tags
+    are not compared: when only they differ, the image is retagged, not rebuilt.
+    --no-cache and the service-level no_cache and pull options always rebuild.
+    BuildKit builds that push directly (--buildkit --push) never load the image
+    locally, so they are never considered unchanged.
+    """
+    if no_cache or service_config.get("no_cache") or service_config.get("pull"):
+        return False
+    if not build_record["sha1"] or not built:
+        return False
+
+    if any(
+        built.get(key) != value
+        for key, value in build_record.items()
+        if key != "additional_tags"
+    ):
+        return False
+    if service_config["push"] and not built.get("pushed"):
+        return False
+
+    return build_record["image"] in get_local_images()
+
+
+def build_service(
+    service_name,
+    service_config,
+    dry_run=False,
+    no_cache=False,
+    log_to_file=False,
+    force=False,
+):
+    """
+    Build the docker image.
+    With log_to_file, docker output is written to build/<service>/build.log and
+    echoed line by line with a [service] prefix, so parallel builds stay legible.
+    Nexus builds whose artifact sha1 and build context match the last build are
+    skipped (or only retagged) unless force, no_cache or pull.
+    """
 
     version = service_config.get("version", "latest")
     registry = service_config.get("registry", DEFAULT_REGISTRY)
@@ -667,11 +1291,10 @@ def build_service(service_name, service_config, dry_run=False, no_cache=False):
         f"\n🚀 Processing {service_name} ({version}) using {service_config.get('build_method')}..."
     )
 
-    # Prepare build directory
+    # Prepare build directory (updated in place, stale files are pruned)
     build_path = os.path.join(BUILD_DIR_BASE, service_name)
-    if os.path.exists(build_path):
-        shutil.rmtree(build_path)
-    os.makedirs(build_path)
+    os.makedirs(build_path, exist_ok=True)
+    prune_build_context(build_path)
 
     # Generate Dockerfile
     generate_dockerfile(service_name, service_config, build_path)
@@ -683,7 +1306,7 @@ def build_service(service_name, service_config, dry_run=False, no_cache=False):
     dest_script = os.path.join(scripts_dest, "download-artifact.sh")
 
     if os.path.exists(src_script):
-        shutil.copy(src_script, dest_script)
+        sync_file(src_script, dest_script)
     else:
         print(
             f"Warning: {src_script} not found. Build might fail if using Nexus method."
@@ -693,14 +1316,45 @@ def build_service(service_name, service_config, dry_run=False, no_cache=False):
     src_settings = os.path.join(TEMPLATES_DIR, "settings.xml")
     dest_settings = os.path.join(build_path, "settings.xml")
     if os.path.exists(src_settings):
-        shutil.copy(src_settings, dest_settings)
+        sync_file(src_settings, dest_settings)
         print(f"   ℹ️  Copied settings.xml to {build_path}")
     else:
         # Create minimal settings
-        with open(dest_settings, "w") as f:
-            f.write(
-                '<settings xmlns="http://maven.apache.org/SETTINGS/1.0.0"><mirrors/></settings>'
+        write_if_changed(
+            dest_settings,
+            '<settings xmlns="http://maven.apache.org/SETTINGS/1.0.0"><mirrors/></settings>',
+        )
+
+    # Keep local bookkeeping files out of the docker build context
+    write_if_changed(
+        os.path.join(build_path, ".dockerignore"),
+        "".join(f"{name}\n" for name in BUILD_CONTEXT_IGNORED),
+    )
+    # Skip the build if the same Nexus artifact was already built into this image
+    # One record per version, so that building several versions of a service
+    # (--n-tags, --list-tags) does not overwrite the others
+    version_key = str(service_config.get("version", "latest")).replace(os.sep, "_")
+    built_sha_file = os.path.join(build_path, f".built-sha-{version_key}")
+    build_record = {
+        "image": image_name,
+        "sha1": service_config.get("artifact_sha1"),
+        "context": hash_build_context(build_path),
+        "additional_tags": sorted(service_config.get("additional_tags", [])),
+    }
+    built = load_build_record(built_sha_file)
+    image_unchanged = (
+        not dry_run
+        and not force
+        and is_build_unchanged(built, build_record, service_config, no_cache)
+    )
+    if image_unchanged:
+        if built.get("additional_tags") == build_record["additional_tags"]:
+            print(
+                f"   ⏩ {image_name} unchanged (artifact sha1 {build_record['sha1']})"
             )
+            return
+        print(f"   ⏩ {image_name} unchanged, updating its tags")
+
     if dry_run:
         print(f"   ✅ Dockerfile generated in {build_path}")
         print(f"   [Dry Run] Would build: {image_name}")
@@ -709,9 +1363,12 @@ def build_service(service_name, service_config, dry_run=False, no_cache=False):
         return
 
     # Docker Build Command
-    cmd = [
-        "docker",
-        "build",
+    # With buildx and --push, the image and its additional tags are pushed by
+    # the build itself instead of separate docker tag/push calls.
+    buildkit = service_config.get("buildkit")
+    fused_push = bool(buildkit and service_config["push"])
+    cmd = ["docker", "buildx", "build"] if buildkit else ["docker", "build"]
+    cmd += [
         "-t",
         image_name,
         "--build-arg",
@@ -724,11 +1381,29 @@ def build_service(service_name, service_config, dry_run=False, no_cache=False):
         f"COMMIT={service_config.get('commit', 'HEAD')}",
         "--build-arg",
         f"CACHE_BYPASS={int(time.time())}",
-        ".",  # Context is build_path
+        # Embed cache metadata in the image so later builds can reuse its layers
+        "--build-arg",
+        "BUILDKIT_INLINE_CACHE=1",
     ]
 
     if no_cache or service_config.get("no_cache"):
         cmd.append("--no-cache")
+    else:
+        # A missing cache image is a harmless miss
+        for cache_image in (image_name, f"{registry}/{service_name}:latest"):
+            cmd.extend(["--cache-from", cache_image])
+
+    if buildkit:
+        cmd.append("--cache-to=type=inline")
+        if fused_push:
+            for tag in service_config.get("additional_tags", []):
+                cmd.extend(["-t", f"{registry}/{service_name}:{tag}"])
+            cmd.append("--push")
+        else:
+            cmd.append("--load")
+
+    cmd.append(".")  # Context is build_path
+    build_env = {**os.environ, "DOCKER_BUILDKIT": "1"}
 
     # We DO NOT use --pull directly because it fails with our local builders.
     # Instead, we pull the external runtime base image if requested.
@@ -742,121 +1417,303 @@ def build_service(service_name, service_config, dry_run=False, no_cache=False):
         if str(java_version).lower() == "none":
             return
         base_image = f"eclipse-temurin:{java_version}-jre-jammy"
-        print(f"   📡 Pulling external runtime base image: {base_image}...")
-        try:
-            subprocess.check_call(
-                ["docker", "pull", base_image],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        except subprocess.CalledProcessError:
-            print(
-                f"   ⚠️  Warning: Failed to pull base image {base_image}. Build might use local cache."
-            )
+        pull_base_image(base_image, "external runtime base image")
 
-    print(f"   🔨 Building {image_name}...")
-    try:
-        subprocess.check_call(cmd, cwd=build_path)
-        print(f"   ✅ Build successful: {image_name}")
-
-        if service_config["push"]:
-            print(f"   📤 Pushing {image_name}...")
-            subprocess.check_call(["docker", "push", image_name])
-            print("   ✅ Push successful")
+    log_path = os.path.join(build_path, "build.log")
+    log = open(log_path, "w", encoding="utf-8") if log_to_file else None
 
-        # Additional Tags (e.g. latest)
-        for tag in service_config.get("additional_tags", []):
-            tag_name = f"{registry}/{service_name}:{tag}"
+    try:
+        # An unchanged image was already pushed; only its tags are updated
+        if not image_unchanged:
+            print(f"   🔨 Building {image_name}...")
+            run_docker(cmd, log, service_name, cwd=build_path, env=build_env)
+            print(f"   ✅ Build successful: {image_name}")
+
+            if fused_push:
+                print("   ✅ Push successful")
+            elif service_config["push"]:
+                print(f"   📤 Pushing {image_name}...")
+                run_docker(["docker", "push", image_name], log, service_name)
+                print("   ✅ Push successful")
+
+        # Additional Tags (e.g. latest), already applied by buildx on fused pushes
+        tag_names = [
+            f"{registry}/{service_name}:{tag}"
+            for tag in ([] if fused_push else service_config.get("additional_tags", []))
+        ]
+        for tag_name in tag_names:
             print(f"   🏷️  Tagging {tag_name}...")
-            subprocess.check_call(["docker", "tag", image_name, tag_name])
-            if service_config["push"]:
-                print(f"   📤 Pushing {tag_name}...")
-                subprocess.check_call(["docker", "push", tag_name])
+            run_docker(["docker", "tag", image_name, tag_name], log, service_name)
+
+        if service_config["push"] and tag_names:
+            # The layers were uploaded by the primary push, so the tag pushes
+            # are only manifest updates and can run concurrently
+            print(f"   📤 Pushing {', '.join(tag_names)}...")
+            with ThreadPoolExecutor(max_workers=TAG_PUSH_WORKERS) as executor:
+                list(
+                    executor.map(
+                        lambda tag_name: run_docker(
+                            ["docker", "push", tag_name], log, service_name
+                        ),
+                        tag_names,
+                    )
+                )
+
+        if build_record["sha1"]:
+            build_record["pushed"] = bool(service_config["push"])
+            write_if_changed(built_sha_file, json.dumps(build_record))
 
     except subprocess.CalledProcessError as e:
+        if log:
+            print(f"   ❌ Build failed: {image_name} (see {log_path})")
         sys.exit(1)
+    finally:
+        if log:
+            log.close()
 
 
-def main():
-    args = docopt(__doc__, version="LA Docker Builder 0.1")
+class BufferedThreadOutput:
+    """
+    sys.stdout proxy that collects the output of a worker thread while
+    buffered() is active and writes it in one block when the thread is done,
+    so the progress messages of parallel builds stay readable.
+    """
 
-    # Load dependencies
-    dependencies_url = args["--dependencies"]
-    dependencies = {}
-    if deps_utils:
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def write_live(self, text):
+        """Write directly to the stream, even from a buffered thread"""
+        with self._lock:
+            self.stream.write(text)
+            self.stream.flush()
+
+    def flush(self):
+        if getattr(self._local, "buffer", None) is None:
+            self.stream.flush()
+
+    @contextmanager
+    def buffered(self):
+        self._local.buffer = []
         try:
-            dependencies = deps_utils.load_dependencies(dependencies_url)
-            if not dependencies:
-                print(
-                    f"⚠️  Warning: Failed to load dependencies from {dependencies_url}"
-                )
-        except Exception as e:
-            print(f"⚠️  Warning: Error loading dependencies: {e}")
-    else:
+            yield
+        finally:
+            text = "".join(self._local.buffer)
+            self._local.buffer = None
+            with self._lock:
+                self.stream.write(text)
+                self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def build_service_versions(
+    tasks, dry_run=False, no_cache=False, log_to_file=False, force=False
+):
+    """
+    Build all versions of one service sequentially (they share build/<service>/).
+    Returns the list of (service_name, version) that failed.
+    """
+    failed = []
+    for name, svc_conf in tasks:
+        try:
+            build_service(name, svc_conf, dry_run, no_cache, log_to_file, force)
+        except SystemExit:
+            failed.append((name, svc_conf.get("version", "latest")))
+    return failed
+
+
+def build_service_versions_buffered(output, *args):
+    """Run build_service_versions with its console output buffered"""
+    with output.buffered():
+        return build_service_versions(*args)
+
+
+def check_build_tasks(final_build_tasks, use_url_cache=True, with_sha1=False):
+    """
+    Check the Nexus URLs of all nexus build tasks and print the results.
+    Stores artifact digests on the task configs; exits if any URL is invalid.
+    """
+    print("\n🔎 Checking Nexus URLs for all selected services...")
+    check_results = []
+    has_failures = False
+
+    # Only nexus builds are checked
+    nexus_tasks = []
+    other_tasks = []
+    for task in final_build_tasks:
+        if task[1].get("build_method") == "nexus":
+            nexus_tasks.append(task)
+        else:
+            other_tasks.append(task)
+
+    # HEAD requests are network-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=NEXUS_CHECK_WORKERS) as executor:
+        nexus_results = list(
+            executor.map(
+                lambda task: check_service_nexus(*task, use_url_cache, with_sha1),
+                nexus_tasks,
+            )
+        )
+    save_artifacts_seen()
+
+    for (name, svc_conf), result in zip(nexus_tasks, nexus_results):
+        check_results.append(result)
+        if not result["success"]:
+            has_failures = True
+        if result["sha1"]:
+            svc_conf["artifact_sha1"] = result["sha1"]
+
+        # Print immediate feedback
         print(
-            "⚠️  Warning: deps_utils module not found. Dynamic Java versioning disabled."
+            f"   {result['icon']} {name} ({svc_conf.get('version')}) [Java {svc_conf.get('java_version')}]: {result['url']}"
         )
 
-    # If args are passed, they override default strings.
-    # If args['--config'] is None, use default 'build-config.yml'
-    config_file = args["--config"] or "build-config.yml"
-    defs_file = args["--defs"] or "services-definition.yml"
+    for name, svc_conf in other_tasks:
+        print(
+            f"   ⏭️  {name} ({svc_conf.get('version')}) [Java {svc_conf.get('java_version')}]: Skipped (method: {svc_conf.get('build_method')})"
+        )
 
-    config = load_config(config_file, defs_file)
+    # If failures, abort (even in dry-run, we show results then stop)
+    if has_failures:
+        print("\n❌ Nexus URL Check Failed for the following services:")
+        for res in check_results:
+            if not res["success"]:
+                print(f"   - {res['name']} ({res['version']}) -> {res['url']}")
 
-    services_to_build = []
+        print("\n🛑 Aborting verify/build process due to invalid URLs.")
+        sys.exit(1)
 
-    if args["--all"]:
-        services_to_build_names = list(config["services"].keys())
-    elif args["--service"]:
-        services_to_build_names = args["--service"]
-    elif args["--from-file"]:
-        from_file = args["--from-file"]
-        if not os.path.exists(from_file):
-            print(f"Error: File not found: {from_file}")
-            sys.exit(1)
-        with open(from_file, "r") as f:
-            if from_file.endswith(".json"):
-                data = json.load(f)
-            else:
-                data = yaml.safe_load(f)
+    print("\n✅ All Nexus URLs validated. Proceeding...\n")
 
-            # Expecting either a list of names or a dict with a 'services' list
-            if isinstance(data, list):
-                services_to_build_names = data
-            elif isinstance(data, dict) and "services" in data:
-                services_to_build_names = data["services"]
-            else:
-                print(
-                    f"Error: Invalid format in {from_file}. Expected list of services."
-                )
-                sys.exit(1)
-    else:
-        services_to_build_names = []
 
-    if not services_to_build_names:
-        print("No services selected to build. Use --service, --all or --from-file.")
-        sys.exit(0)
+def get_dependencies_stamp(dependencies):
+    """
+    Version of the --dependencies source for the plan cache key: the mtime and
+    size of a local file, or the sha256 of a remote file's cached copy after
+    revalidating it (load_dependencies is memoized, so planning reuses it).
+    """
+    if not dependencies.startswith("http"):
+        return cache_utils._file_stamp(dependencies)
 
-    # Filter out skipped services
-    skip_services = args.get("--skip-service") or []
-    if skip_services:
-        print(f"   🚫 Skipping services: {skip_services}")
-        services_to_build_names = [
-            s for s in services_to_build_names if s not in skip_services
-        ]
+    deps_utils = _get_deps_utils()
+    if deps_utils is None:
+        return None
+    deps_utils.load_dependencies(dependencies)
+    cache_file, _ = deps_utils.get_cache_files(dependencies)
+    try:
+        with open(cache_file, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
 
-    if not services_to_build_names:
-        print("All selected services were skipped. Nothing to build.")
-        sys.exit(0)
 
+def get_plan_cache_file(services_to_build_names, config, args):
+    """
+    Cache file of the build plan for these services, config and CLI options.
+    Options that only affect execution are left out of the key; the
+    --dependencies source is keyed by its current version.
+    """
+    key = json.dumps(
+        {
+            "services": services_to_build_names,
+            "config": config,
+            "dependencies": get_dependencies_stamp(args.get("--dependencies") or ""),
+            "args": {
+                option: value
+                for option, value in args.items()
+                if option not in PLAN_IGNORED_OPTIONS
+            },
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return PLANS_CACHE_DIR / (url_cache_key(key) + ".json")
+
+
+def load_cached_plan(plan_file):
+    """Load a build plan saved within PLAN_CACHE_TTL_SECONDS, or None"""
+    try:
+        if time.time() - plan_file.stat().st_mtime > PLAN_CACHE_TTL_SECONDS:
+            return None
+        with open(plan_file, "rb") as f:
+            tasks = cache_utils.json_loads(f.read())["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return [(name, svc_conf) for name, svc_conf in tasks]
+
+
+def save_cached_plan(plan_file, final_build_tasks):
+    """Save a build plan (skipped if it does not round-trip through JSON)"""
+    cache_utils.save_json_cache(
+        plan_file,
+        {"data": [[name, svc_conf] for name, svc_conf in final_build_tasks]},
+    )
+
+
+def plan_build_tasks(services_to_build_names, config, args):
+    """
+    Expand the selected services into build tasks: resolve versions from Nexus
+    metadata or GitHub tags and the Java version of each task.
+    Returns (list of (service_name, final_config), complete), where complete
+    is False if some metadata or tags lookup came back empty (e.g. a failed
+    fetch), so the plan must not be reused.
+    """
     # --- EXPANSION PHASE ---
     # Expand services based on versions (e.g. latest -> [1.0.1, 1.0.2])
     expanded_build_list = []  # List of (service_name, final_config)
+    complete = True  # No lookup came back empty
 
-    for name in services_to_build_names:
-        svc_conf = get_service_config(name, config, args)
+    cli_overrides = get_cli_overrides(args)
+    svc_confs = [
+        (name, get_service_config(name, config, cli_overrides))
+        for name in services_to_build_names
+    ]
 
+    # Fetch Nexus metadata (services resolving 'latest') and GitHub tags
+    # (repo-tags services) for all services concurrently
+    n_tags = int(args.get("--n-tags", 1))
+    update_metadata = args.get("--update-metadata", False)
+    metadata_tasks = [
+        (name, svc_conf)
+        for name, svc_conf in svc_confs
+        if svc_conf.get("build_method") == "nexus"
+        and svc_conf.get("version", "latest") == "latest"
+    ]
+    # A specific tag is searched for in the last 100 tags
+    tags_tasks = [
+        (
+            name,
+            svc_conf,
+            n_tags if svc_conf.get("version", "latest") == "latest" else 100,
+        )
+        for name, svc_conf in svc_confs
+        if svc_conf.get("build_method") == "repo-tags" and not args.get("--branch")
+    ]
+    with ThreadPoolExecutor(max_workers=NEXUS_CHECK_WORKERS) as executor:
+        metadata_futures = {
+            name: executor.submit(
+                get_nexus_versions, name, svc_conf, n_tags, update_metadata
+            )
+            for name, svc_conf in metadata_tasks
+        }
+        tags_futures = {
+            task[0]: executor.submit(get_github_tags, *task) for task in tags_tasks
+        }
+    nexus_versions = {name: f.result() for name, f in metadata_futures.items()}
+    github_tags = {name: f.result() for name, f in tags_futures.items()}
+
+    for name, svc_conf in svc_confs:
         is_nexus = svc_conf.get("build_method") == "nexus"
         version = svc_conf.get("version", "latest")
 
@@ -865,11 +1722,10 @@ def main():
         # 1. Method is Nexus
         # 2. Version is 'latest' (meaning user didn't specify a specific version tag)
         if is_nexus and version == "latest":
-            n_tags = int(args.get("--n-tags", 1))
-            update_metadata = args.get("--update-metadata", False)
-            versions = get_nexus_versions(name, svc_conf, n_tags, update_metadata)
+            versions = nexus_versions[name]
 
             if not versions:
+                complete = False
                 print(
                     f"   ⚠️  No versions found for {name} in Nexus metadata. Keeping 'latest' (will likely fail)."
                 )
@@ -877,8 +1733,13 @@ def main():
             else:
                 print(f"   ✨ Resolved versions for {name}: {versions}")
                 for i, v in enumerate(versions):
-                    v_conf = svc_conf.copy()
-                    v_conf["version"] = v
+                    v_conf = {
+                        **svc_conf,
+                        "version": v,
+                        # Listed in the metadata, so the check phase can skip the
+                        # HEAD for the default artifact (.war, no classifier)
+                        "version_in_metadata": True,
+                    }
                     # Tag the last one as latest
                     if i == len(versions) - 1:
                         v_conf["additional_tags"] = ["latest"]
@@ -899,18 +1760,19 @@ def main():
             if version_arg != "latest":
                 # If a specific tag is requested, find it in the tags list (searching a larger pool if needed)
                 # or fallback to using the version string as the tag name.
-                tags_info = get_github_tags(name, svc_conf, 100)  # Search last 100 tags
-                tags_info = [t for t in tags_info if t[0] == version_arg]
+                tags_info = [t for t in github_tags[name] if t[0] == version_arg]
+                if not github_tags[name]:
+                    complete = False
                 if not tags_info:
                     print(
                         f"   ⚠️  Tag {version_arg} not found in last 100 tags for {name}. Falling back to version name."
                     )
                     tags_info = [(version_arg, version_arg)]
             else:
-                n_tags = int(args.get("--n-tags", 1))
-                tags_info = get_github_tags(name, svc_conf, n_tags)
+                tags_info = github_tags[name]
 
             if not tags_info:
+                complete = False
                 print(f"   ⚠️  No tags found for {name}. Skipping.")
             else:
                 if version_arg == "latest":
@@ -923,11 +1785,13 @@ def main():
                     )
 
                 for i, (version, original_tag) in enumerate(tags_info):
-                    v_conf = svc_conf.copy()
-                    v_conf["version"] = version
-                    # METHOD MAPPING: repo-tags -> repo-branch with tag as branch
-                    v_conf["build_method"] = "repo-branch"
-                    v_conf["branch"] = original_tag
+                    v_conf = {
+                        **svc_conf,
+                        "version": version,
+                        # METHOD MAPPING: repo-tags -> repo-branch with tag as branch
+                        "build_method": "repo-branch",
+                        "branch": original_tag,
+                    }
                     # Tag the last one as latest ONLY if original request was 'latest'
                     if version_arg == "latest" and i == len(tags_info) - 1:
                         v_conf["additional_tags"] = ["latest"]
@@ -937,89 +1801,210 @@ def main():
             # Explicit version or not Nexus
             expanded_build_list.append((name, svc_conf))
 
+    # Collapse identical builds, merging their additional tags, so that the
+    # check, Java resolution and build phases do not repeat work
+    unique_builds = {}
+    for name, v_conf in expanded_build_list:
+        key = (
+            name,
+            v_conf.get("version"),
+            v_conf.get("build_method"),
+            v_conf.get("branch"),
+        )
+        if key not in unique_builds:
+            unique_builds[key] = (name, v_conf)
+            continue
+        kept = unique_builds[key][1]
+        extra_tags = v_conf.get("additional_tags") or []
+        kept_tags = kept.get("additional_tags") or []
+        if extra_tags:
+            kept["additional_tags"] = list(dict.fromkeys(kept_tags + extra_tags))
+    expanded_build_list = list(unique_builds.values())
+
     # --- RESOLVE VALIDATION & JAVA VERSIONS ---
+    # dependencies.yaml is only needed when some task has no pinned Java version
+    deps_utils = None
+    dependencies = {}
+    if any("java_version" not in v_conf for _, v_conf in expanded_build_list):
+        deps_utils = _get_deps_utils()
+        dependencies_url = args["--dependencies"]
+        if deps_utils:
+            try:
+                dependencies = deps_utils.load_dependencies(dependencies_url)
+                if not dependencies:
+                    print(
+                        f"⚠️  Warning: Failed to load dependencies from {dependencies_url}"
+                    )
+            except Exception as e:
+                print(f"⚠️  Warning: Error loading dependencies: {e}")
+        else:
+            print(
+                "⚠️  Warning: deps_utils module not found. Dynamic Java versioning disabled."
+            )
+
     final_build_tasks = []  # (name, config)
+    java_versions = {}  # (name, version) -> resolved Java version
+    # Flatten dependencies.yaml once instead of rescanning it per task
+    java_index = (
+        deps_utils.build_java_index(dependencies)
+        if deps_utils and dependencies
+        else {}
+    )
 
+    unresolved = []  # (name, version) without a Java version
     for name, svc_conf in expanded_build_list:
         # Determine Java Version
         if "java_version" not in svc_conf:
             # Try to resolve dynamically
-            if deps_utils and dependencies:
-                v = svc_conf.get("version", "latest")
-                dyn = deps_utils.determine_java_version(name, v, dependencies)
-                if dyn:
-                    svc_conf["java_version"] = dyn
-                else:
-                    print(
-                        f"   ❌ Error: Could not determine Java version for {name} ({v}) from dependencies.yaml"
-                    )
-                    print(
-                        f"      Please specify it manually using --java-version=<ver> or in services-definition.yml"
-                    )
-                    sys.exit(1)
-            else:
+            v = svc_conf.get("version", "latest")
+            if java_index and (name, v) not in java_versions:
+                java_versions[(name, v)] = deps_utils.resolve_java_version(
+                    name, v, java_index
+                )
+            dyn = java_versions.get((name, v))
+            if not dyn:
+                unresolved.append((name, v))
+                continue
+            svc_conf["java_version"] = dyn
+
+        final_build_tasks.append((name, svc_conf))
+
+    # Report every service without a Java version at once
+    if unresolved:
+        for name, v in unresolved:
+            if java_index:
                 print(
-                    f"   ❌ Error: Java version for {name} must be specified manually using --java-version=<ver>"
+                    f"   ❌ Error: Could not determine Java version for {name} ({v}) from dependencies.yaml"
                 )
+            else:
                 print(
-                    f"      or resolved via dependencies.yaml (which is currently unavailable or missing deps_utils)."
+                    f"   ❌ Error: Java version for {name} ({v}) must be specified manually using --java-version=<ver>"
                 )
-                sys.exit(1)
+        if java_index:
+            print(
+                f"      Please specify it manually using --java-version=<ver> or in services-definition.yml"
+            )
+        else:
+            print(
+                f"      or resolved via dependencies.yaml (which is currently unavailable or missing deps_utils)."
+            )
+        sys.exit(1)
 
-        final_build_tasks.append((name, svc_conf))
+    return final_build_tasks, complete
 
-    # --- GLOBAL CHECK PHASE ---
-    print("\n🔎 Checking Nexus URLs for all selected services...")
-    check_results = []
-    has_failures = False
 
-    for name, svc_conf in final_build_tasks:
-        version = svc_conf.get("version")
-
-        # Only check if build method is nexus
-        java_version = svc_conf.get("java_version")
-        if svc_conf.get("build_method") == "nexus":
-            success, url = check_nexus_url(name, svc_conf)
-            status_icon = "✅" if success else "❌"
-            check_results.append(
-                {
-                    "name": name,
-                    "version": version,
-                    "java_version": java_version,
-                    "url": url,
-                    "success": success,
-                    "icon": status_icon,
-                }
-            )
-            if not success:
-                has_failures = True
+def parse_jobs(value):
+    """Parse --jobs, exiting with an error unless it is a positive integer"""
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        print(f"Error: --jobs must be a positive integer, got '{value}'")
+        sys.exit(1)
+    return jobs
+
+
+def main():
+    args = docopt(__doc__, version="LA Docker Builder 0.1")
+
+    # Validate before any planning work
+    if args.get("--jobs"):
+        parse_jobs(args["--jobs"])
+
+    # If args are passed, they override default strings.
+    # If args['--config'] is None, use default 'build-config.yml'
+    config_file = args["--config"] or "build-config.yml"
+    defs_file = args["--defs"] or "services-definition.yml"
+
+    config = load_config(config_file, defs_file)
 
-            # Print immediate feedback
-            print(f"   {status_icon} {name} ({version}) [Java {java_version}]: {url}")
+    services_to_build = []
+
+    if args["--all"]:
+        services_to_build_names = list(config["services"].keys())
+    elif args["--service"]:
+        services_to_build_names = args["--service"]
+    elif args["--from-file"]:
+        from_file = args["--from-file"]
+        if not os.path.exists(from_file):
+            print(f"Error: File not found: {from_file}")
+            sys.exit(1)
+        if from_file.endswith(".json"):
+            with open(from_file, "r") as f:
+                data = json.load(f)
+        else:
+            data = cache_utils.load_yaml_cached(from_file)
+
+        # Expecting either a list of names or a dict with a 'services' list
+        if isinstance(data, list):
+            services_to_build_names = data
+        elif isinstance(data, dict) and "services" in data:
+            services_to_build_names = data["services"]
         else:
             print(
-                f"   ⏭️  {name} ({version}) [Java {java_version}]: Skipped (method: {svc_conf.get('build_method')})"
+                f"Error: Invalid format in {from_file}. Expected list of services."
             )
+            sys.exit(1)
+    else:
+        services_to_build_names = []
 
-    # If failures, abort (even in dry-run, we show results then stop)
-    if has_failures:
-        print("\n❌ Nexus URL Check Failed for the following services:")
-        for res in check_results:
-            if not res["success"]:
-                print(f"   - {res['name']} ({res['version']}) -> {res['url']}")
+    if not services_to_build_names:
+        print("No services selected to build. Use --service, --all or --from-file.")
+        sys.exit(0)
 
-        print("\n🛑 Aborting verify/build process due to invalid URLs.")
-        sys.exit(1)
+    # Drop repeated names (e.g. --service=a --service=a), keeping the order
+    services_to_build_names = list(dict.fromkeys(services_to_build_names))
 
-    print("\n✅ All Nexus URLs validated. Proceeding...\n")
+    # Filter out skipped services
+    skip_services = args.get("--skip-service") or []
+    if skip_services:
+        print(f"   🚫 Skipping services: {skip_services}")
+        skip_set = set(skip_services)
+        services_to_build_names = [
+            s for s in services_to_build_names if s not in skip_set
+        ]
+
+    if not services_to_build_names:
+        print("All selected services were skipped. Nothing to build.")
+        sys.exit(0)
+
+    # --- PLANNING PHASE ---
+    # Reuse the plan of a recent identical invocation (e.g. a --dry-run
+    # followed by the real build) instead of querying Nexus/GitHub again
+    plan_file = get_plan_cache_file(services_to_build_names, config, args)
+    final_build_tasks = None
+    if not args.get("--update-metadata"):
+        final_build_tasks = load_cached_plan(plan_file)
+    if final_build_tasks is None:
+        final_build_tasks, complete = plan_build_tasks(
+            services_to_build_names, config, args
+        )
+        # A plan built from failed lookups would be replayed for the whole TTL
+        if complete:
+            save_cached_plan(plan_file, final_build_tasks)
+    else:
+        print(f"📦 Using cached build plan ({len(final_build_tasks)} tasks)")
+
+    # --- GLOBAL CHECK PHASE ---
+    # A dry run only generates Dockerfiles, so its network checks are opt-in
+    if args["--dry-run"] and not (args["--check"] or args["--verify-urls"]):
+        print("\n⏭️  Dry run: skipping Nexus URL checks (use --verify-urls).\n")
+    else:
+        # Artifact digests are only needed when images will actually be built
+        check_build_tasks(
+            final_build_tasks,
+            use_url_cache=not args.get("--no-url-cache"),
+            with_sha1=not (args["--check"] or args["--dry-run"] or args["--force"]),
+        )
 
     if args["--check"]:
         print("🏁 Check-only mode: Validation successful. Exiting.")
         sys.exit(0)
 
     # --- BUILD PHASE ---
+    # Ensure builders exist before building any service
     for name, svc_conf in final_build_tasks:
-        # Ensure builder exists before building the service
         registry = svc_conf.get("registry", DEFAULT_REGISTRY)
         java_version = svc_conf.get("java_version", DEFAULT_JAVA_VERSION)
         tool = svc_conf.get("build_tool", "gradle")
@@ -1036,7 +2021,58 @@ def main():
                 dry_run=args["--dry-run"],
             )
 
-        build_service(name, svc_conf, args["--dry-run"], args["--no-cache"])
+    # Group versions per service: they share a build directory
+    service_groups = {}
+    for name, svc_conf in final_build_tasks:
+        service_groups.setdefault(name, []).append((name, svc_conf))
+
+    if args.get("--jobs"):
+        jobs = parse_jobs(args["--jobs"])
+    else:
+        jobs = min(len(service_groups), os.cpu_count() or 1)
+
+    if jobs <= 1:
+        for name, svc_conf in final_build_tasks:
+            build_service(
+                name,
+                svc_conf,
+                args["--dry-run"],
+                args["--no-cache"],
+                force=args.get("--force"),
+            )
+        return
+
+    print(
+        f"\n⚙️  Building {len(service_groups)} services with {jobs} parallel jobs..."
+    )
+    failed = []
+    output = BufferedThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    build_service_versions_buffered,
+                    output,
+                    tasks,
+                    args["--dry-run"],
+                    args["--no-cache"],
+                    not args["--dry-run"],
+                    args.get("--force"),
+                )
+                for tasks in service_groups.values()
+            ]
+            for future in as_completed(futures):
+                failed.extend(future.result())
+    finally:
+        sys.stdout = output.stream
+
+    if failed:
+        print("\n❌ Build failed for the following services:")
+        for name, version in failed:
+            log_path = os.path.join(BUILD_DIR_BASE, name, "build.log")
+            print(f"   - {name} ({version}) -> {log_path}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
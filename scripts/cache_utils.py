@@ -0,0 +1,183 @@
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+# orjson is considerably faster for the cache files; fall back to the stdlib
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+YAML_CACHE_DIR = Path.home() / ".cache" / "la-docker-images" / "yaml"
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """
+    Return the libyaml-backed CSafeLoader, or SafeLoader with a one-time warning.
+    """
+    import yaml
+    if hasattr(yaml, 'CSafeLoader'):
+        return yaml.CSafeLoader
+    print("⚠️  Warning: PyYAML was built without libyaml, YAML parsing will be slow. "
+          "Install libyaml-dev and reinstall pyyaml to fix it.")
+    return yaml.SafeLoader
+
+
+def parse_yaml(stream):
+    """
+    Parse YAML, preferring the libyaml C bindings (bundled in PyYAML wheels).
+    yaml is imported here so that cache hits never load it.
+    """
+    import yaml
+    return yaml.load(stream, Loader=_yaml_loader())
+
+
+@lru_cache(maxsize=None)
+def _yaml_dumper():
+    """
+    Return the libyaml-backed CSafeDumper, or SafeDumper if it is unavailable.
+    """
+    import yaml
+    return getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def dump_yaml(data, stream, **kwargs):
+    """
+    Serialize YAML with the libyaml C emitter when available.
+    """
+    import yaml
+    return yaml.dump(data, stream, Dumper=_yaml_dumper(), **kwargs)
+
+
+def _yaml_cache_file(path):
+    """
+    Return the JSON sidecar location for a YAML file.
+    """
+    abs_path = os.path.abspath(path)
+    return YAML_CACHE_DIR / (hashlib.blake2b(abs_path.encode('utf-8')).hexdigest() + '.json')
+
+
+def load_yaml_cached(path):
+    """
+    Load a YAML file, reusing a JSON sidecar cache while the file is unchanged.
+    The cache is keyed by path and invalidated on any mtime or size change.
+    Parsed documents are also memoized in-process; callers get a deep copy
+    and may mutate it freely.
+    """
+    st = os.stat(path)
+    return copy.deepcopy(_load_yaml_snapshot(os.path.abspath(path), st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=16)
+def _load_yaml_snapshot(path, mtime_ns, size):
+    """
+    Parse a YAML file (or its sidecar) once per (path, mtime, size).
+    The result is shared and must not be mutated.
+    """
+    st = os.stat(path)
+    cache_file = _yaml_cache_file(path)
+
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = json_loads(f.read())
+        if cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size:
+            return cached.get('data')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    with open(path, 'rb') as f:
+        data = parse_yaml(f)
+
+    save_yaml_cache(cache_file, st, data)
+    return data
+
+
+def save_yaml_cache(cache_file, st, data):
+    """
+    Write the JSON sidecar for a parsed YAML document.
+    Documents that do not survive a JSON round-trip (dates, non-string keys) are not cached.
+    """
+    save_json_cache(cache_file, {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'data': data})
+
+
+def save_json_cache(cache_file, entry):
+    """
+    Atomically write a cache entry whose 'data' must survive a JSON round-trip.
+    """
+    try:
+        payload = json_dumps(entry)
+        if json_loads(payload)['data'] != entry['data']:
+            return
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cache_file, payload)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def atomic_write_bytes(path, payload, keep_mode=False):
+    """
+    Write a file via a temporary file and os.replace, so that concurrent
+    readers (other threads or processes) never see a partial file.
+    With keep_mode, an existing file keeps its permission bits.
+    """
+    tmp_file = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        if keep_mode and os.path.exists(path):
+            shutil.copymode(path, tmp_file)
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+def _file_stamp(path):
+    """
+    (path, mtime_ns, size) of a file, or None if it does not exist.
+    """
+    abs_path = os.path.abspath(path)
+    try:
+        st = os.stat(abs_path)
+    except OSError:
+        return None
+    return [abs_path, st.st_mtime_ns, st.st_size]
+
+
+def load_derived_cached(paths, compute):
+    """
+    Return compute(), cached as JSON for as long as none of the input paths change.
+    Used for results derived from several files (e.g. the merged build config);
+    a missing input file is part of the key as well.
+    """
+    stamp = [_file_stamp(path) for path in paths]
+    key = '\0'.join(os.path.abspath(path) for path in paths)
+    digest = hashlib.blake2b(key.encode('utf-8')).hexdigest()
+    cache_file = YAML_CACHE_DIR / f'derived-{digest}.json'
+
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = json_loads(f.read())
+        if cached.get('stamp') == stamp:
+            return cached.get('data')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    data = compute()
+    save_json_cache(cache_file, {'stamp': stamp, 'data': data})
+    return data
@@ -1,14 +1,19 @@
-import requests
-import yaml
 import sys
 
 import os
 import time
+import hashlib
+import re
+from functools import lru_cache
+from operator import ge, gt, le, lt
 from pathlib import Path
+from types import MappingProxyType
 from packaging import version as pkg_version
 
+from cache_utils import atomic_write_bytes, json_dumps, json_loads, load_yaml_cached, parse_yaml
+
 # Mapping from local service name (services-definition.yml) to dependencies.yaml key
-NAME_MAPPING = {
+_COMMON_NAME_MAPPING = {
     'ala-bie-hub': 'ala-bie',
     'image-service': 'images',
     'specieslist-webapp': 'species-lists',
@@ -16,203 +21,297 @@ NAME_MAPPING = {
     'spatial-hub': 'spatial',
     'sds-webapp2': 'sds',
     'doi-service': 'doi',
+    'data-quality-filter-service': 'data-quality',
+}
+NAME_MAPPING = MappingProxyType({
+    **_COMMON_NAME_MAPPING,
     'ala-namematching-server': 'namematching-service',
     'ala-sensitive-data-server': 'sensitive-data-service',
-    'data-quality-filter-service': 'data-quality',
     'la-pipelines': 'pipelines'
-}
+})
+# sync_versions.py follows the keys of
+# ansible/roles/docker-compose/tasks/determine-java-versions.yml, which differ
+# for these services. Kept separate so that each caller resolves the same key
+# as before when dependencies.yaml has both spellings.
+SYNC_NAME_MAPPING = MappingProxyType({
+    **_COMMON_NAME_MAPPING,
+    'bie-index': 'species',
+    'ala-namematching-server': 'namematching',
+    'ala-sensitive-data-server': 'sensitive-data'
+})
+
+@lru_cache(maxsize=None)
+def dependency_key_candidates(name):
+    """
+    Return the possible dependencies.yaml keys for a mapped name, in order:
+    the name itself, then with dashes vs underscores swapped.
+    """
+    return tuple(dict.fromkeys((name, name.replace('-', '_'), name.replace('_', '-'))))
+
+def find_dependency_key(service_name, dependencies, mapping=NAME_MAPPING):
+    """
+    Return the key of a service in dependencies.yaml (or an index built from it), or None.
+    """
+    for candidate in dependency_key_candidates(mapping.get(service_name, service_name)):
+        if candidate in dependencies:
+            return candidate
+    return None
 
 CACHE_DIR = Path.home() / ".cache" / "la-docker-images"
-CACHE_FILE = CACHE_DIR / "dependencies.yaml"
 CACHE_DURATION_SECONDS = 24 * 60 * 60  # 24 hours
 
-def get_cached_dependencies():
+def get_cache_files(url):
+    """
+    Return the (content, metadata) cache files for a dependencies URL.
+    """
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"dependencies-{key}.yaml", CACHE_DIR / f"dependencies-{key}.meta.json"
+
+def get_cache_validators(url):
+    """
+    Return conditional GET headers for a cached dependencies URL.
+    """
+    cache_file, meta_file = get_cache_files(url)
+    if not cache_file.exists():
+        return {}
+    try:
+        with open(meta_file, 'rb') as f:
+            meta = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def get_cached_dependencies(url):
     """
     Retrieve dependencies from cache if valid.
     """
-    if not CACHE_FILE.exists():
+    cache_file, _ = get_cache_files(url)
+    if not cache_file.exists():
         return None
 
     # Check file age
-    file_age = time.time() - CACHE_FILE.stat().st_mtime
+    file_age = time.time() - cache_file.stat().st_mtime
     if file_age > CACHE_DURATION_SECONDS:
         return None
 
     try:
-        with open(CACHE_FILE, 'r') as f:
-            print(f"Loading dependencies from cache: {CACHE_FILE}")
-            return yaml.safe_load(f)
+        print(f"Loading dependencies from cache: {cache_file}")
+        return load_yaml_cached(cache_file)
     except Exception as e:
         print(f"Warning: Could not load cache: {e}")
         return None
 
-def save_to_cache(content):
+def save_to_cache(url, content, etag=None, last_modified=None):
     """
-    Save dependencies to cache.
+    Save the raw dependencies.yaml bytes to cache.
     """
+    cache_file, meta_file = get_cache_files(url)
     try:
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
-            f.write(content)
-        print(f"Saved dependencies to cache: {CACHE_FILE}")
+        atomic_write_bytes(cache_file, content)
+        atomic_write_bytes(meta_file, json_dumps({'etag': etag, 'last_modified': last_modified}))
+        print(f"Saved dependencies to cache: {cache_file}")
+        return True
     except Exception as e:
         print(f"Warning: Could not save to cache: {e}")
+        return False
+
+@lru_cache(maxsize=None)
+def get_http_session():
+    """
+    Keep-alive session for dependency downloads that retries transient failures.
+    requests already negotiates gzip responses.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    session = requests.Session()
+    session.headers['User-Agent'] = 'la-docker-images'
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, HTTPAdapter(max_retries=retries))
+    return session
 
+@lru_cache(maxsize=None)
 def load_dependencies(url_or_path):
     """
     Load dependencies from URL or local path.
+    Remote URLs are revalidated with a conditional GET on every load; the
+    fixed cache age is only used when the server sent no ETag/Last-Modified.
     """
     try:
         if url_or_path.startswith('http'):
-            # Try to load from cache first if it's a remote URL
-            cached_data = get_cached_dependencies()
-            if cached_data:
-                return cached_data
+            cache_file, _ = get_cache_files(url_or_path)
+            headers = get_cache_validators(url_or_path)
+
+            if not headers:
+                # Without validators the cache age is the only freshness signal
+                cached_data = get_cached_dependencies(url_or_path)
+                if cached_data:
+                    return cached_data
+
+            import requests
 
             print(f"Fetching dependencies from {url_or_path}...")
-            resp = requests.get(url_or_path)
+            try:
+                resp = get_http_session().get(url_or_path, headers=headers, timeout=(3.05, 30))
+            except requests.RequestException as e:
+                if not cache_file.exists():
+                    raise
+                print(f"Warning: Could not revalidate dependencies ({e}), using cache: {cache_file}")
+                return load_yaml_cached(cache_file)
+            if resp.status_code == 304:
+                # Only sent with validators, which make the cache age irrelevant; the
+                # file is left untouched so its mtime-keyed parsed sidecar stays valid
+                print(f"Dependencies not modified, reusing cache: {cache_file}")
+                return load_yaml_cached(cache_file)
             resp.raise_for_status()
             
             # Save to cache
-            save_to_cache(resp.text)
-            
-            return yaml.safe_load(resp.text)
+            saved = save_to_cache(
+                url_or_path,
+                resp.content,
+                resp.headers.get('ETag'),
+                resp.headers.get('Last-Modified'),
+            )
+
+            if saved:
+                # Parse through the YAML cache so later runs load the JSON sidecar
+                return load_yaml_cached(cache_file)
+            return parse_yaml(resp.content)
         else:
-            with open(url_or_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_yaml_cached(url_or_path)
     except Exception as e:
         print(f"Warning: Could not load dependencies from {url_or_path}: {e}")
         return {}
 
+# One clause of an Ansible-style constraint such as '>= 3.1.0 < 6.0.0'
+CONSTRAINT_CLAUSE_RE = re.compile(r'(>=|<=|>|<)\s*([^\s<>=]+)')
+
+
+# Comparison for each constraint operator. Plain Version comparisons are used
+# rather than PEP 440 specifiers, whose '<' and '>' exclude pre-, post- and
+# local releases of the bound (e.g. '< 6.0.0' would reject 6.0.0rc1)
+CONSTRAINT_OPERATORS = {
+    '>=': ge,
+    '<=': le,
+    '>': gt,
+    '<': lt,
+}
+
+
+@lru_cache(maxsize=None)
+def compile_constraint(constraint_str):
+    """
+    Parse a constraint such as '>= 3.1.0 < 6.0.0' once into a tuple of
+    (comparison, Version) pairs. Returns None if a target version cannot
+    be parsed; such a constraint never matches.
+    """
+    compiled = []
+    for op, target in CONSTRAINT_CLAUSE_RE.findall(str(constraint_str)):
+        try:
+            compiled.append((CONSTRAINT_OPERATORS[op], pkg_version.parse(target)))
+        except Exception:
+            return None
+    return tuple(compiled)
+
+
+def matches_compiled_constraint(ver, compiled):
+    """
+    Check if a parsed version matches a constraint from compile_constraint.
+    """
+    return compiled is not None and all(compare(ver, target) for compare, target in compiled)
+
+
+@lru_cache(maxsize=4096)
 def matches_constraint(version_str, constraint_str):
     """
     Check if a version matches a constraint.
+    Memoized: the same (version, constraint) pairs recur across services and tags.
     """
-    version_str = str(version_str).strip()
-    constraint_str = str(constraint_str).strip()
-
     try:
-        ver = pkg_version.parse(version_str)
+        ver = pkg_version.parse(str(version_str).strip())
     except Exception:
         return False
 
-    parts = constraint_str.split()
-    i = 0
-    all_match = True
-
-    while i < len(parts):
-        operator = None
-        target = None
-        
-        part = parts[i]
-        
-        if part.startswith('>='):
-            operator = '>='
-            target_str = part[2:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part.startswith('<='):
-            operator = '<='
-            target_str = part[2:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part.startswith('>'):
-            operator = '>'
-            target_str = part[1:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part.startswith('<'):
-            operator = '<'
-            target_str = part[1:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part in ['>=', '<=', '>', '<']:
-            operator = part
-            if i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-
-        if operator and target:
-            try:
-                target_ver = pkg_version.parse(target)
-                if operator == '>=' and not (ver >= target_ver):
-                    all_match = False; break
-                elif operator == '<=' and not (ver <= target_ver):
-                    all_match = False; break
-                elif operator == '>' and not (ver > target_ver):
-                    all_match = False; break
-                elif operator == '<' and not (ver < target_ver):
-                    all_match = False; break
-            except Exception:
-                return False
-        i += 1
-        
-    return all_match
+    return matches_compiled_constraint(ver, compile_constraint(constraint_str))
 
-def determine_java_version(service_name, service_version, dependencies_dict):
+
+def build_java_index(dependencies_dict):
     """
-    Determine Java version from LA Toolkit dependencies.yaml
+    Flatten dependencies.yaml in a single pass into
+    {dep_key: (highest_java, [(compiled constraint, java_version), ...])}
+    so that resolving many (service, version) pairs does not rescan or
+    re-parse it.
     """
-    # default_java = '11' # REMOVED: Should not fallback to default
-    
-    # Resolve name mapping
-    dep_key = NAME_MAPPING.get(service_name, service_name)
-    
-    # Try direct match or variations
-    if dep_key not in dependencies_dict:
-        if dep_key.replace('-', '_') in dependencies_dict:
-            dep_key = dep_key.replace('-', '_')
-        elif dep_key.replace('_', '-') in dependencies_dict:
-            dep_key = dep_key.replace('_', '-')
-        else:
-            # Service not found in dependencies
-            return None
+    index = {}
+    for dep_key, service_deps in dependencies_dict.items():
+        highest_java = None
+        constraints = []
+
+        if isinstance(service_deps, dict):
+            for constraint, requirements in service_deps.items():
+                if not isinstance(requirements, list):
+                    continue
+
+                java_ver = None
+                for req in requirements:
+                    if isinstance(req, dict) and 'java' in req:
+                        java_ver = str(req['java']).strip()
+                        break
+
+                if not java_ver:
+                    continue
+
+                # Track highest
+                try:
+                    if highest_java is None or int(java_ver) > int(highest_java):
+                        highest_java = java_ver
+                except ValueError:
+                    pass
 
-    service_deps = dependencies_dict.get(dep_key, {})
-    if not service_deps:
+                constraints.append((compile_constraint(constraint), java_ver))
+
+        index[dep_key] = (highest_java, constraints)
+    return index
+
+
+def resolve_java_version(service_name, service_version, java_index):
+    """
+    Determine Java version from an index built by build_java_index
+    """
+    dep_key = find_dependency_key(service_name, java_index)
+    if dep_key is None:
+        # Service not found in dependencies
         return None
 
-    highest_java = None
-    matched_java = None
-
-    for constraint, requirements in service_deps.items():
-        if not isinstance(requirements, list):
-            continue
-
-        java_ver = None
-        for req in requirements:
-            if isinstance(req, dict) and 'java' in req:
-                java_ver = str(req['java']).strip()
-                break
-        
-        if not java_ver:
-            continue
-            
-        # Track highest
-        try:
-            if highest_java is None or int(java_ver) > int(highest_java):
-                highest_java = java_ver
-        except:
-             pass
-            
-        if service_version == 'develop':
-            continue
-            
-        try:
-            if matches_constraint(service_version, constraint):
-                matched_java = java_ver
-        except Exception:
-            pass
-            
+    highest_java, constraints = java_index[dep_key]
+
     if service_version in ['develop', 'latest'] or not service_version:
         return highest_java
-        
-    return matched_java
+
+    try:
+        ver = pkg_version.parse(str(service_version).strip())
+    except Exception:
+        return None
+
+    # The last matching constraint wins, so scan from the end and stop at the first match
+    for compiled, java_ver in reversed(constraints):
+        if matches_compiled_constraint(ver, compiled):
+            return java_ver
+
+    return None
+
+
+def determine_java_version(service_name, service_version, dependencies_dict):
+    """
+    Determine Java version from LA Toolkit dependencies.yaml
+    """
+    return resolve_java_version(service_name, service_version, build_java_index(dependencies_dict))
@@ -1,6 +1,7 @@
-import yaml
 import os
 
+from cache_utils import dump_yaml, parse_yaml
+
 # Source and destination paths
 SOURCE_FILE = '/home/vjrj/proyectos/gbif/dev/ala-install-docker/ansible/roles/docker-compose/vars/docker-services-desc.yaml'
 DEST_FILE = '../services-definition.yml'
@@ -10,8 +11,8 @@ def main():
         print(f"Error: Source file not found: {SOURCE_FILE}")
         return
 
-    with open(SOURCE_FILE, 'r') as f:
-        source_data = yaml.safe_load(f)
+    with open(SOURCE_FILE, 'rb') as f:
+        source_data = parse_yaml(f)
 
     services = {}
     
@@ -61,7 +62,7 @@ def main():
 
     # Write to destination
     with open(DEST_FILE, 'w') as f:
-        yaml.dump({'services': services}, f, default_flow_style=False, sort_keys=False)
+        dump_yaml({'services': services}, f, default_flow_style=False, sort_keys=False)
     
     print(f"Successfully migrated {len(services)} services to {DEST_FILE}")
 
@@ -15,98 +15,20 @@ Options:
 """
 import os
 import sys
-import yaml
-import requests
 from docopt import docopt
-from packaging import version as pkg_version
+
+from cache_utils import dump_yaml, parse_yaml
+from deps_utils import SYNC_NAME_MAPPING, find_dependency_key, get_http_session, matches_constraint
 
 def load_yaml(path):
     if not os.path.exists(path):
         return {}
-    with open(path, 'r') as f:
-        return yaml.safe_load(f) or {}
+    with open(path, 'rb') as f:
+        return parse_yaml(f) or {}
 
 def save_yaml(path, data):
     with open(path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-
-def matches_constraint(version_str, constraint_str):
-    """
-    Check if a version matches a constraint.
-    Replicates logic from Ansible filter plugin.
-    """
-    version_str = str(version_str).strip()
-    constraint_str = str(constraint_str).strip()
-
-    try:
-        ver = pkg_version.parse(version_str)
-    except Exception:
-        return False
-
-    # Handle combined constraints like '>= 3.1.0 < 6.0.0'
-    # Simplified splitting by space might not work if spaces are irregular but works for standard cases
-    # Logic adapted from filter_plugins/java_version.py
-    
-    parts = constraint_str.split()
-    i = 0
-    all_match = True
-
-    while i < len(parts):
-        operator = None
-        target = None
-        
-        part = parts[i]
-        
-        if part.startswith('>='):
-            operator = '>='
-            target_str = part[2:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part.startswith('<='):
-            operator = '<='
-            target_str = part[2:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part.startswith('>'):
-            operator = '>'
-            target_str = part[1:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part.startswith('<'):
-            operator = '<'
-            target_str = part[1:].strip()
-            if target_str: target = target_str
-            elif i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-        elif part in ['>=', '<=', '>', '<']:
-            operator = part
-            if i + 1 < len(parts):
-                target = parts[i + 1]
-                i += 1
-
-        if operator and target:
-            try:
-                target_ver = pkg_version.parse(target)
-                if operator == '>=' and not (ver >= target_ver):
-                    all_match = False; break
-                elif operator == '<=' and not (ver <= target_ver):
-                    all_match = False; break
-                elif operator == '>' and not (ver > target_ver):
-                    all_match = False; break
-                elif operator == '<' and not (ver < target_ver):
-                    all_match = False; break
-            except Exception:
-                return False
-        i += 1
-        
-    return all_match
+        dump_yaml(data, f, default_flow_style=False, sort_keys=False)
 
 def determine_java_version(service_name, service_version, dependencies_dict):
     """
@@ -162,9 +84,9 @@ def main():
     
     print(f"Fetching dependencies from {url}...")
     try:
-        resp = requests.get(url)
+        resp = get_http_session().get(url, timeout=(3.05, 30))
         resp.raise_for_status()
-        dependencies = yaml.safe_load(resp.text)
+        dependencies = parse_yaml(resp.content)
     except Exception as e:
         print(f"Error fetching dependencies: {e}")
         sys.exit(1)
@@ -229,60 +151,28 @@ def main():
     
     updated_count = 0
     
-    # Mapping from local service name (services-definition.yml) to dependencies.yaml key
-    # Based on ansible/roles/docker-compose/tasks/determine-java-versions.yml
-    NAME_MAPPING = {
-        'ala-bie-hub': 'ala-bie',
-        'bie-index': 'species',
-        'image-service': 'images',
-        'specieslist-webapp': 'species-lists',
-        'logger-service': 'logger',
-        'spatial-hub': 'spatial',
-        'sds-webapp2': 'sds',
-        'doi-service': 'doi',
-        'ala-namematching-server': 'namematching',
-        'ala-sensitive-data-server': 'sensitive-data',
-        'data-quality-filter-service': 'data-quality'
-    }
+    services_cfg = build_config['services'] = build_config['services'] or {}
 
     for name, svc_def in def_services.items():
-        # Get current configured version
-        current_version = 'develop'
-        # Check if version is explicitly set in build-config
-        if name in build_config['services'] and 'version' in build_config['services'][name]:
-            current_version = build_config['services'][name]['version']
-        
-        # Check if name exists in dependencies
-        # 1. Explicit mapping
-        # 2. Exact match
-        # 3. Dashes vs underscores substitution
-        
-        dep_key = None
+        service_cfg = services_cfg.get(name, {})
+        # Get current configured version, explicitly set in build-config or develop
+        current_version = service_cfg.get('version', 'develop')
         
-        if name in NAME_MAPPING:
-             dep_key = NAME_MAPPING[name]
-        elif name in dependencies:
-             dep_key = name
-        elif name.replace('-', '_') in dependencies:
-             dep_key = name.replace('-', '_')
-        elif name.replace('_', '-') in dependencies:
-             dep_key = name.replace('_', '-')
+        # Check if name exists in dependencies (explicit mapping, exact
+        # match, or dashes vs underscores substitution)
+        dep_key = find_dependency_key(name, dependencies, SYNC_NAME_MAPPING)
 
-        if dep_key and dep_key in dependencies:
+        if dep_key:
             java_ver = determine_java_version(dep_key, current_version, dependencies)
             
-            if name not in build_config['services']:
-                build_config['services'][name] = {}
+            service_cfg = services_cfg.setdefault(name, service_cfg)
             
             # Only update if changed or new
-            old_java = build_config['services'][name].get('java_version')
+            old_java = service_cfg.get('java_version')
+            service_cfg['java_version'] = java_ver
             if old_java != java_ver:
-                build_config['services'][name]['java_version'] = java_ver
                 print(f"   Updated {name} (as '{dep_key}': {current_version}) -> Java {java_ver}")
                 updated_count += 1
-            else:
-                # Ensure it's set if missing
-                build_config['services'][name]['java_version'] = java_ver
 
     save_yaml(config_file, build_config)
     print(f"✅ Updated Java versions for {updated_count} services in {config_file}")
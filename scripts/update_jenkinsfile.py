@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Update Jenkinsfile service descriptions from services-definition.yml.
+YAML is parsed with libyaml (CSafeLoader) when PyYAML is built with it
+(python3-yaml, or the pyyaml wheels), and cached under ~/.cache/la-docker-images.
 
 Usage:
   update_jenkinsfile.py [--check] [--jenkinsfile=<file>] [--defs=<file>]
@@ -13,57 +15,98 @@ Options:
   -h --help             Show this help message.
 """
 
+import hashlib
 import os
 import sys
-import yaml
 import re
+from functools import lru_cache
+from pathlib import Path
 from docopt import docopt
 
+from cache_utils import atomic_write_bytes, load_yaml_cached
+
+# Stamps of Jenkinsfiles found in sync, so --check can skip reading them
+SYNC_STAMP_DIR = Path.home() / ".cache" / "la-docker-images" / "jenkinsfile"
+
+# string(name: 'SERVICE' or 'SKIP_SERVICES', defaultValue: '...', description: '...')
+# parameters; group 2 is the parameter name, group 3 the quoted description that gets replaced.
+# The description ends at its closing quote, so matching never backtracks over the rest of the line
+DESCRIPTION_RE = re.compile(r"""(string\(name:\s*['"](SERVICE|SKIP_SERVICES)['"],[^)]*?description:\s*)("[^"\n]*"|'[^'\n]*')""")
+
 def load_services(defs_file):
-    if not os.path.exists(defs_file):
+    # Reuses the parsed file across runs while its mtime and size are unchanged
+    try:
+        data = load_yaml_cached(defs_file)
+    except FileNotFoundError:
         print(f"Error: Services definition file not found: {defs_file}")
         sys.exit(1)
-    
-    with open(defs_file, 'r') as f:
-        data = yaml.safe_load(f)
-        if not data or 'services' not in data:
-            print(f"Error: No services found in {defs_file}")
-            sys.exit(1)
-        return sorted(list(data['services'].keys()))
+    if not data or 'services' not in data:
+        print(f"Error: No services found in {defs_file}")
+        sys.exit(1)
+    return sorted(data['services'])
+
+@lru_cache(maxsize=4)
+def get_descriptions(services):
+    """
+    Return the expected description of the SERVICE and SKIP_SERVICES parameters
+    for a tuple of service names. The result is shared and must not be mutated.
+    """
+    # List of services as a string
+    services_list_str = ", ".join(services)
+    return {
+        'SERVICE': f"\"Service(s) to build (comma-separated, or 'all'). Available: {services_list_str}\"",
+        'SKIP_SERVICES': f"\"Service(s) to skip (comma-separated). Available: {services_list_str}\""
+    }
+
+def get_sync_stamp(jenkinsfile, descriptions):
+    """
+    Return a digest of the Jenkinsfile state (path, mtime, size) and the
+    descriptions it should contain.
+    """
+    st = os.stat(jenkinsfile)
+    key = '\0'.join([os.path.abspath(jenkinsfile), str(st.st_mtime_ns), str(st.st_size), *descriptions])
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+def get_sync_stamp_file(jenkinsfile):
+    digest = hashlib.blake2b(os.path.abspath(jenkinsfile).encode('utf-8'), digest_size=16).hexdigest()
+    return SYNC_STAMP_DIR / f"{digest}.stamp"
+
+def is_stamped_in_sync(jenkinsfile, descriptions):
+    try:
+        with open(get_sync_stamp_file(jenkinsfile), 'r') as f:
+            return f.read() == get_sync_stamp(jenkinsfile, descriptions)
+    except OSError:
+        return False
+
+def save_sync_stamp(jenkinsfile, descriptions):
+    try:
+        SYNC_STAMP_DIR.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(get_sync_stamp_file(jenkinsfile), get_sync_stamp(jenkinsfile, descriptions).encode('utf-8'))
+    except OSError:
+        pass
 
 def update_jenkinsfile(jenkinsfile, services, check_only=False):
-    if not os.path.exists(jenkinsfile):
+    new_descs = get_descriptions(tuple(services))
+    descriptions = list(new_descs.values())
+
+    # Unchanged since it was last found in sync with these descriptions
+    # (a missing Jenkinsfile has no stamp and is reported below)
+    if is_stamped_in_sync(jenkinsfile, descriptions):
+        print("✅ Jenkinsfile descriptions are already in sync.")
+        return True
+
+    try:
+        with open(jenkinsfile, 'r') as f:
+            content = f.read()
+    except FileNotFoundError:
         print(f"Error: Jenkinsfile not found: {jenkinsfile}")
         sys.exit(1)
 
-    with open(jenkinsfile, 'r') as f:
-        content = f.read()
+    # Single pass over the file; an up-to-date description is replaced by itself
+    new_content = DESCRIPTION_RE.sub(lambda m: m.group(1) + new_descs[m.group(2)], content)
 
-    # List of services as a string
-    services_list_str = ", ".join(services)
-    
-    # regex for SERVICE and SKIP_SERVICES descriptions
-    # We look for something like: string(name: 'SERVICE', defaultValue: '...', description: '...')
-    # and we want to replace the content of the description.
-    
-    patterns = [
-        (r"(string\(name:\s*['\"]SERVICE['\"],[^)]*description:\s*)(['\"].*['\"])", f"\"Service(s) to build (comma-separated, or 'all'). Available: {services_list_str}\""),
-        (r"(string\(name:\s*['\"]SKIP_SERVICES['\"],[^)]*description:\s*)(['\"].*['\"])", f"\"Service(s) to skip (comma-separated). Available: {services_list_str}\"")
-    ]
-    
-    new_content = content
-    modified = False
-    
-    for pattern, new_desc in patterns:
-        match = re.search(pattern, new_content)
-        if match:
-            found_desc = match.group(2)
-            if found_desc != new_desc:
-                # Use a lambda or escape backslashes correctly in the replacement string
-                new_content = re.sub(pattern, lambda m: m.group(1) + new_desc, new_content)
-                modified = True
-
-    if not modified:
+    if new_content == content:
+        save_sync_stamp(jenkinsfile, descriptions)
         print("✅ Jenkinsfile descriptions are already in sync.")
         return True
 
@@ -71,8 +114,10 @@ def update_jenkinsfile(jenkinsfile, services, check_only=False):
         print("❌ Jenkinsfile descriptions are OUT OF SYNC!")
         return False
 
-    with open(jenkinsfile, 'w') as f:
-        f.write(new_content)
+    # Only reached when the content changed; readers never see a partial file.
+    # A symlinked Jenkinsfile stays a symlink and the file keeps its mode
+    atomic_write_bytes(os.path.realpath(jenkinsfile), new_content.encode('utf-8'), keep_mode=True)
+    save_sync_stamp(jenkinsfile, descriptions)
     
     print(f"✅ Updated {jenkinsfile} descriptions with {len(services)} services.")
     return True
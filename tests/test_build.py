@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build
+from build import hash_build_context, is_build_unchanged
+
+IMAGE = 'livingatlases/ala-hub:6.0.0'
+
+
+def make_record(**overrides):
+    record = {
+        'image': IMAGE,
+        'sha1': 'abc123',
+        'context': 'ctx',
+        'additional_tags': [],
+    }
+    record.update(overrides)
+    return record
+
+
+class IsBuildUnchangedTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(build, 'get_local_images', return_value={IMAGE})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config = {'push': False}
+
+    def test_unchanged(self):
+        self.assertTrue(is_build_unchanged(make_record(), make_record(), self.config))
+
+    def test_no_previous_build_or_sha1(self):
+        self.assertFalse(is_build_unchanged(None, make_record(), self.config))
+        record = make_record(sha1=None)
+        self.assertFalse(is_build_unchanged(record, record, self.config))
+
+    def test_changed_artifact_or_context(self):
+        self.assertFalse(is_build_unchanged(make_record(sha1='old'), make_record(), self.config))
+        self.assertFalse(is_build_unchanged(make_record(context='old'), make_record(), self.config))
+
+    def test_old_record_format_rebuilds(self):
+        built = {'image': IMAGE, 'sha1': 'abc123', 'dockerfile': 'ctx'}
+        self.assertFalse(is_build_unchanged(built, make_record(), self.config))
+
+    def test_additional_tags_do_not_force_a_rebuild(self):
+        self.assertTrue(
+            is_build_unchanged(make_record(), make_record(additional_tags=['latest']), self.config)
+        )
+
+    def test_no_cache_and_pull_rebuild(self):
+        record = make_record()
+        self.assertFalse(is_build_unchanged(record, record, self.config, no_cache=True))
+        self.assertFalse(is_build_unchanged(record, record, {'push': False, 'no_cache': True}))
+        self.assertFalse(is_build_unchanged(record, record, {'push': False, 'pull': True}))
+
+    def test_push_needs_a_pushed_build(self):
+        config = {'push': True}
+        self.assertFalse(is_build_unchanged(make_record(), make_record(), config))
+        self.assertTrue(is_build_unchanged(make_record(pushed=True), make_record(), config))
+
+    def test_missing_local_image(self):
+        with mock.patch.object(build, 'get_local_images', return_value=set()):
+            self.assertFalse(is_build_unchanged(make_record(), make_record(), self.config))
+
+
+class HashBuildContextTest(unittest.TestCase):
+    def write(self, root, name, content):
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def test_context_files_change_the_hash(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.write(root, 'Dockerfile', 'FROM scratch\n')
+            self.write(root, 'settings.xml', '<settings/>')
+            self.write(root, os.path.join('scripts', 'download-artifact.sh'), 'echo 1\n')
+            first = hash_build_context(root)
+
+            self.write(root, os.path.join('scripts', 'download-artifact.sh'), 'echo 2\n')
+            second = hash_build_context(root)
+            self.assertNotEqual(first, second)
+
+            self.write(root, 'settings.xml', '<settings><mirrors/></settings>')
+            self.assertNotEqual(second, hash_build_context(root))
+
+    def test_ignored_files_do_not_change_the_hash(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.write(root, 'Dockerfile', 'FROM scratch\n')
+            first = hash_build_context(root)
+            self.write(root, 'build.log', 'output')
+            self.write(root, '.built-sha-6.0.0', '{}')
+            self.assertEqual(first, hash_build_context(root))
+
+
+if __name__ == '__main__':
+    unittest.main()
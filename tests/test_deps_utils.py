@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from deps_utils import (
+    SYNC_NAME_MAPPING,
+    build_java_index,
+    find_dependency_key,
+    matches_constraint,
+    resolve_java_version,
+)
+
+
+class MatchesConstraintTest(unittest.TestCase):
+    def test_bounds(self):
+        self.assertTrue(matches_constraint('3.1.0', '>= 3.1.0 < 6.0.0'))
+        self.assertTrue(matches_constraint('5.9', '>=3.1.0 <6'))
+        self.assertFalse(matches_constraint('6.0.0', '>= 3.1.0 < 6.0.0'))
+        self.assertFalse(matches_constraint('3.0', '>= 3.1.0 < 6.0.0'))
+        self.assertTrue(matches_constraint('6.0.0', '<= 6.0.0'))
+
+    def test_pre_releases_below_upper_bound(self):
+        self.assertTrue(matches_constraint('6.0.0rc1', '< 6.0.0'))
+        self.assertTrue(matches_constraint('3.0.0rc1', '< 3.0.0'))
+        self.assertFalse(matches_constraint('3.0.0rc1', '>= 3.0.0'))
+
+    def test_post_and_local_releases_above_lower_bound(self):
+        self.assertTrue(matches_constraint('1.0.post1', '> 1.0'))
+        self.assertTrue(matches_constraint('2.3.0+local', '> 2.3'))
+
+    def test_invalid(self):
+        self.assertFalse(matches_constraint('1.0', '>= bogus'))
+        self.assertFalse(matches_constraint('not a version', '>= 1.0'))
+        self.assertTrue(matches_constraint('1.0', ''))
+
+
+class ResolveJavaVersionTest(unittest.TestCase):
+    def setUp(self):
+        self.index = build_java_index({
+            'ala-hub': {
+                '>= 3.0.0 < 6.0.0': [{'java': 8}],
+                '>= 6.0.0': [{'java': 17}],
+            },
+        })
+
+    def test_boundary_and_rc(self):
+        self.assertEqual(resolve_java_version('ala-hub', '5.9.9', self.index), '8')
+        self.assertEqual(resolve_java_version('ala-hub', '6.0.0rc1', self.index), '8')
+        self.assertEqual(resolve_java_version('ala-hub', '6.0.0', self.index), '17')
+        self.assertEqual(resolve_java_version('ala-hub', 'latest', self.index), '17')
+
+
+class FindDependencyKeyTest(unittest.TestCase):
+    # dependencies.yaml with both spellings of the same services
+    dependencies = {
+        'bie-index': {},
+        'species': {},
+        'namematching-service': {},
+        'namematching': {},
+        'sensitive-data-service': {},
+        'sensitive-data': {},
+        'pipelines': {},
+        'ala_hub': {},
+    }
+
+    def test_build_keys(self):
+        self.assertEqual(find_dependency_key('bie-index', self.dependencies), 'bie-index')
+        self.assertEqual(find_dependency_key('ala-namematching-server', self.dependencies), 'namematching-service')
+        self.assertEqual(find_dependency_key('ala-sensitive-data-server', self.dependencies), 'sensitive-data-service')
+        self.assertEqual(find_dependency_key('la-pipelines', self.dependencies), 'pipelines')
+
+    def test_sync_versions_keys(self):
+        def find(name):
+            return find_dependency_key(name, self.dependencies, SYNC_NAME_MAPPING)
+        self.assertEqual(find('bie-index'), 'species')
+        self.assertEqual(find('ala-namematching-server'), 'namematching')
+        self.assertEqual(find('ala-sensitive-data-server'), 'sensitive-data')
+        self.assertIsNone(find('la-pipelines'))
+
+    def test_dash_underscore_variants(self):
+        self.assertEqual(find_dependency_key('ala-hub', self.dependencies), 'ala_hub')
+        self.assertIsNone(find_dependency_key('collectory', self.dependencies))
+
+
+if __name__ == '__main__':
+    unittest.main()